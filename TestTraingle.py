@@ -7,8 +7,11 @@ Run (use the file's exact name):
   
 """
 
+import itertools
 import unittest
-from Triangle import classifyTriangle
+
+import Triangle
+from Triangle import LABELS, TriangleKind, classify_code, classifyTriangle, classify_triangles
 
 
 class TestTriangles(unittest.TestCase):
@@ -70,5 +73,62 @@ class TestTriangles(unittest.TestCase):
         self.assertEqual(classifyTriangle(199, 199, 1), "Isosceles Triangle")     # near upper bound
 
 
+class TestClassifyCode(unittest.TestCase):
+    def test_matches_scalar(self):
+        edge = (-1, 0, 1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 13, 199, 200, 201)
+        for t in itertools.product(edge, repeat=3):
+            self.assertEqual(classify_code(*t).label, classifyTriangle(*t), t)
+
+    def test_codes(self):
+        self.assertIs(classify_code(3, 4, 5), TriangleKind.RIGHT_SCALENE)
+        self.assertIs(classify_code(5, 5, 5), TriangleKind.EQUILATERAL)
+        self.assertIs(classify_code(3, 4, 5.5), TriangleKind.INVALID)
+        self.assertIs(classify_code("3", 4, 5), TriangleKind.INVALID)
+        self.assertEqual(classify_code(1, 2, 3), 1)
+
+    def test_labels_mapping(self):
+        self.assertEqual([kind.label for kind in TriangleKind], list(LABELS))
+        self.assertEqual(LABELS[TriangleKind.RIGHT_ISOSCELES], "Right Isosceles Triangle")
+
+
+@unittest.skipIf(Triangle.np is None, "numpy not installed")
+class TestClassifyTriangles(unittest.TestCase):
+    def _labels(self, codes):
+        return [LABELS[code] for code in codes]
+
+    def test_matches_scalar_on_small_cube(self):
+        triples = list(itertools.product(range(0, 16), repeat=3))
+        codes = classify_triangles(Triangle.np.array(triples))
+        self.assertEqual(self._labels(codes), [classifyTriangle(*t) for t in triples])
+
+    def test_matches_scalar_near_bounds(self):
+        edge = (-1, 0, 1, 2, 198, 199, 200, 201, 2**40)
+        triples = list(itertools.product(edge, repeat=3))
+        codes = classify_triangles(Triangle.np.array(triples, dtype=Triangle.np.int64))
+        self.assertEqual(self._labels(codes), [classifyTriangle(*t) for t in triples])
+
+    def test_column_arrays(self):
+        np = Triangle.np
+        codes = classify_triangles(np.array([3, 5, 1]), np.array([4, 5, 2]), np.array([5, 7, 3]))
+        self.assertEqual(
+            self._labels(codes),
+            ["Right Scalene Triangle", "Isosceles Triangle", "NotATriangle"],
+        )
+
+    def test_type_rejection(self):
+        np = Triangle.np
+        # a float array is rejected as a whole, like classifyTriangle(3, 4, 5.0)
+        self.assertEqual(self._labels(classify_triangles(np.array([[3.0, 4.0, 5.0]]))), ["InvalidInput"])
+        # a mixed Python list is judged per element, not upcast to float
+        rows = [[3, 4, 5], [3, 4, 5.5], ["3", 4, 5], [True, True, True]]
+        self.assertEqual(self._labels(classify_triangles(rows)), [classifyTriangle(*r) for r in rows])
+
+    def test_bad_shape(self):
+        with self.assertRaises(ValueError):
+            classify_triangles(Triangle.np.array([1, 2, 3]))
+        with self.assertRaises(TypeError):
+            classify_triangles(Triangle.np.array([1, 2, 3]), Triangle.np.array([1, 2, 3]))
+
+
 if __name__ == "__main__":
     unittest.main(verbosity=2)
@@ -10,9 +10,55 @@ Returns one of:
   - "Scalene Triangle"
   - "Right Isosceles Triangle"
   - "Right Scalene Triangle"
+
+classify_code() returns the same answer as a TriangleKind (IntEnum) code and
+classify_triangles() does it over whole NumPy arrays; LABELS[code] maps any
+code back to the string above.
 """
 
-from typing import Tuple
+from enum import IntEnum
+from typing import Any, Optional, Tuple
+
+try:  # optional: only needed for the batch API (classify_triangles)
+    import numpy as np
+except ImportError:  # pragma: no cover - exercised only without numpy
+    np = None  # type: ignore[assignment]
+
+
+class TriangleKind(IntEnum):
+    """Compact result codes; LABELS[kind] (or kind.label) is the classifyTriangle string."""
+    INVALID = 0
+    NOT_A_TRIANGLE = 1
+    EQUILATERAL = 2
+    ISOSCELES = 3
+    SCALENE = 4
+    RIGHT_ISOSCELES = 5
+    RIGHT_SCALENE = 6
+
+    @property
+    def label(self) -> str:
+        return LABELS[self]
+
+
+# Labels indexed by result code (TriangleKind / classify_triangles output)
+LABELS: Tuple[str, ...] = (
+    "InvalidInput",
+    "NotATriangle",
+    "Equilateral Triangle",
+    "Isosceles Triangle",
+    "Scalene Triangle",
+    "Right Isosceles Triangle",
+    "Right Scalene Triangle",
+)
+
+# module-level aliases: a global lookup is cheaper than TriangleKind.X in hot paths
+_INVALID = TriangleKind.INVALID
+_NOT_A_TRIANGLE = TriangleKind.NOT_A_TRIANGLE
+_EQUILATERAL = TriangleKind.EQUILATERAL
+_ISOSCELES = TriangleKind.ISOSCELES
+_SCALENE = TriangleKind.SCALENE
+_RIGHT_ISOSCELES = TriangleKind.RIGHT_ISOSCELES
+_RIGHT_SCALENE = TriangleKind.RIGHT_SCALENE
 
 
 def _is_valid_inputs(a: int, b: int, c: int) -> bool:
@@ -76,7 +122,118 @@ def classifyTriangle(a: int, b: int, c: int) -> str:
     return "Scalene Triangle"
 
 
+def classify_code(a: int, b: int, c: int) -> TriangleKind:
+    """
+    Same classification as classifyTriangle, but returns a TriangleKind code.
+
+    Inlines the helper checks, so a call skips the generator-based all()
+    validity checks and the sorted() tuple of the right-angle test (the
+    arithmetic still creates int objects for results above 256); use
+    kind.label to get the classifyTriangle string.
+    """
+    if not (isinstance(a, int) and isinstance(b, int) and isinstance(c, int)):
+        return _INVALID
+    if not (0 < a <= 200 and 0 < b <= 200 and 0 < c <= 200):
+        return _INVALID
+    if a + b <= c or a + c <= b or b + c <= a:
+        return _NOT_A_TRIANGLE
+    if a == b == c:
+        return _EQUILATERAL
+    a2, b2, c2 = a * a, b * b, c * c
+    # for positive sides, x^2 + y^2 == z^2 can only hold with z the largest,
+    # so checking all three pairings is the same as sorting first
+    is_right = a2 + b2 == c2 or a2 + c2 == b2 or b2 + c2 == a2
+    if a == b or b == c or a == c:
+        return _RIGHT_ISOSCELES if is_right else _ISOSCELES
+    return _RIGHT_SCALENE if is_right else _SCALENE
+
+
+def _column_valid(col: Any) -> Tuple[Any, Any]:
+    """
+    Return (valid_mask, int32 values) for one column of sides.
+    Mirrors _is_valid_inputs: ints (bools included) in 1..200, anything else invalid.
+    Invalid positions are replaced by 1 so the arithmetic below stays in range.
+    """
+    kind = col.dtype.kind
+    if kind in "iub":
+        valid = (col >= 1) & (col <= 200)
+        return valid, np.where(valid, col, 1).astype(np.int32)
+    if kind == "O":
+        # mixed Python objects: keep the scalar isinstance(x, int) rule per element
+        is_int = np.frompyfunc(lambda x: isinstance(x, int), 1, 1)(col).astype(bool)
+        safe = np.where(is_int, col, 0)
+        valid = is_int & (safe >= 1).astype(bool) & (safe <= 200).astype(bool)
+        return valid, np.where(valid, safe, 1).astype(np.int32)
+    # floats, strings, ... are never valid (same as classifyTriangle(3, 4, 5.0))
+    return np.zeros(col.shape, dtype=bool), np.ones(col.shape, dtype=np.int32)
+
+
+def _as_column(x: Any) -> Any:
+    arr = np.asarray(x)
+    if not isinstance(x, np.ndarray) and arr.dtype.kind not in "iub":
+        # a Python list mixing ints and floats would be upcast to float64;
+        # keep the original objects so each element is judged on its own type
+        arr = np.asarray(x, dtype=object)
+    return arr
+
+
+def classify_triangles(sides: Any, b: Optional[Any] = None, c: Optional[Any] = None) -> Any:
+    """
+    Classify many triangles at once (requires numpy).
+
+    Call either as classify_triangles(sides) with an (N, 3) array of side triples,
+    or as classify_triangles(a, b, c) with three length-N column arrays.
+
+    Returns a uint8 array of TriangleKind codes; LABELS[code] is the label
+    that classifyTriangle would return for the same triple.
+    """
+    if np is None:
+        raise ImportError("classify_triangles requires numpy")
+
+    if b is None and c is None:
+        arr = _as_column(sides)
+        if arr.ndim != 2 or arr.shape[1] != 3:
+            raise ValueError(f"expected an (N, 3) array of sides, got shape {arr.shape}")
+        cols = (arr[:, 0], arr[:, 1], arr[:, 2])
+    elif b is not None and c is not None:
+        cols = (_as_column(sides), _as_column(b), _as_column(c))
+        if not (cols[0].ndim == cols[1].ndim == cols[2].ndim == 1) or not (
+            len(cols[0]) == len(cols[1]) == len(cols[2])
+        ):
+            raise ValueError("column arrays a, b, c must be 1-D and the same length")
+    else:
+        raise TypeError("pass either one (N, 3) array or three column arrays")
+
+    (va, a), (vb, b_), (vc, c_) = (_column_valid(col) for col in cols)
+    valid = va & vb & vc
+
+    is_triangle = (a + b_ > c_) & (a + c_ > b_) & (b_ + c_ > a)
+    is_equilateral = (a == b_) & (b_ == c_)
+    is_isosceles = (a == b_) | (b_ == c_) | (a == c_)
+    # for positive sides, x^2 + y^2 == z^2 can only hold with z the largest,
+    # so checking all three pairings is the same as sorting first
+    a2, b2, c2 = a * a, b_ * b_, c_ * c_
+    is_right = (a2 + b2 == c2) | (a2 + c2 == b2) | (b2 + c2 == a2)
+
+    codes = np.full(a.shape, _SCALENE, dtype=np.uint8)
+    codes[is_isosceles] = _ISOSCELES
+    codes[is_right & ~is_isosceles] = _RIGHT_SCALENE
+    codes[is_right & is_isosceles] = _RIGHT_ISOSCELES
+    codes[is_equilateral] = _EQUILATERAL
+    codes[~is_triangle] = _NOT_A_TRIANGLE
+    codes[~valid] = _INVALID
+    return codes
+
+
 if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) > 1:
+        # Streaming mode: python3 Triangle.py <file.csv|file.jsonl|-> [--workers N ...]
+        from triangle_stream import main
+
+        sys.exit(main(sys.argv[1:]))
+
     # Tiny sanity run if you execute this file directly
     samples: Tuple[Tuple[int, int, int], ...] = (
         (3, 4, 5),
@@ -0,0 +1,231 @@
+"""
+bench_triangle.py
+Micro/macro benchmarks for the triangle classifier, with a regression gate.
+
+Every result is a time in nanoseconds per unit of work (per call, per row),
+so lower is always better:
+  latency.<func>.<category>   one call of classifyTriangle / classify_code
+  batch.<engine>              ns per row classifying a batch of mixed triples
+  sweep.<engine>              ns per triple over the full 1..200 domain
+                              (classifyTriangle: 1..100 by default, since the
+                              full domain takes it ~20s)
+
+Run:
+  python3 bench_triangle.py run -o bench_baseline.json
+  python3 bench_triangle.py compare bench_baseline.json --threshold 0.25
+
+compare re-runs the suite and exits 1 if any benchmark got slower than
+baseline * (1 + threshold). Benchmarks missing on either side are reported
+but never fail the gate (e.g. numpy not installed).
+"""
+
+from __future__ import annotations
+
+import argparse
+import itertools
+import json
+import platform
+import sys
+import time
+import timeit
+from typing import Callable, Dict, List, Tuple
+
+import Triangle
+from Triangle import classify_code, classifyTriangle
+
+BASELINE_VERSION = 1
+DEFAULT_THRESHOLD = 0.25
+
+# one representative triple per result category
+CATEGORIES: Dict[str, Tuple[int, int, int]] = {
+    "invalid": (0, 1, 1),
+    "not_a_triangle": (1, 2, 3),
+    "equilateral": (5, 5, 5),
+    "isosceles": (5, 5, 7),
+    "scalene": (4, 5, 6),
+    "right": (3, 4, 5),
+}
+
+
+def _best_ns_per_call(stmt: Callable[[], object], repeat: int, min_time: float) -> float:
+    timer = timeit.Timer(stmt)
+    # size each timing run to take about min_time seconds
+    estimate = timer.timeit(number=100) / 100
+    number = max(1, int(min_time / estimate)) if estimate > 0 else 1000
+    return min(timer.repeat(repeat=repeat, number=number)) / number * 1e9
+
+
+def bench_latency(repeat: int = 5, min_time: float = 0.2) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    for func in (classifyTriangle, classify_code):
+        for category, (a, b, c) in CATEGORIES.items():
+            results[f"latency.{func.__name__}.{category}"] = _best_ns_per_call(
+                lambda: func(a, b, c), repeat, min_time
+            )
+    return results
+
+
+def _mixed_triples(n: int) -> List[Tuple[int, int, int]]:
+    # cycle through the domain edge-to-edge so every category shows up
+    return [((i * 7) % 203 - 1, (i * 13) % 203 - 1, (i * 29) % 203 - 1) for i in range(n)]
+
+
+def bench_batch(rows: int = 100_000, repeat: int = 3) -> Dict[str, float]:
+    triples = _mixed_triples(rows)
+    results: Dict[str, float] = {}
+
+    for func in (classifyTriangle, classify_code):
+        def scalar() -> None:
+            for t in triples:
+                func(*t)
+
+        results[f"batch.{func.__name__}"] = (
+            min(timeit.repeat(scalar, number=1, repeat=repeat)) / rows * 1e9
+        )
+
+    if Triangle.np is not None:
+        arr = Triangle.np.array(triples, dtype=Triangle.np.int64)
+        results["batch.classify_triangles"] = (
+            min(timeit.repeat(lambda: Triangle.classify_triangles(arr), number=1, repeat=repeat))
+            / rows * 1e9
+        )
+    return results
+
+
+def bench_sweep(bound: int = 200, reference_bound: int = 100) -> Dict[str, float]:
+    """
+    Time for classifying every triple in 1..bound (ns per triple);
+    classifyTriangle sweeps 1..reference_bound instead (0 skips it).
+    """
+    results: Dict[str, float] = {}
+    total = bound ** 3
+    rng = range(1, bound + 1)
+
+    for func, n in ((classifyTriangle, min(bound, reference_bound)), (classify_code, bound)):
+        if n <= 0:
+            continue
+        start = time.perf_counter()
+        for a, b, c in itertools.product(range(1, n + 1), repeat=3):
+            func(a, b, c)
+        results[f"sweep.{func.__name__}"] = (time.perf_counter() - start) / n ** 3 * 1e9
+
+    np = Triangle.np
+    if np is not None:
+        start = time.perf_counter()
+        side = np.arange(1, bound + 1, dtype=np.int32)
+        bb, cc = (m.ravel() for m in np.meshgrid(side, side, indexing="ij"))
+        for x in rng:  # one (bound^2)-row slab at a time keeps memory flat
+            Triangle.classify_triangles(np.full(bb.size, x, dtype=np.int32), bb, cc)
+        results["sweep.classify_triangles"] = (time.perf_counter() - start) / total * 1e9
+    return results
+
+
+def run_suite(
+    *,
+    repeat: int = 5,
+    min_time: float = 0.2,
+    batch_rows: int = 100_000,
+    sweep_bound: int = 200,
+    reference_sweep_bound: int = 100,
+) -> Dict[str, float]:
+    results: Dict[str, float] = {}
+    results.update(bench_latency(repeat, min_time))
+    results.update(bench_batch(batch_rows))
+    if sweep_bound > 0:
+        results.update(bench_sweep(sweep_bound, reference_sweep_bound))
+    return results
+
+
+def save_baseline(path: str, results: Dict[str, float]) -> None:
+    doc = {
+        "version": BASELINE_VERSION,
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "unit": "ns",
+        "results": results,
+    }
+    with open(path, "w") as f:
+        json.dump(doc, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load_baseline(path: str) -> Dict[str, float]:
+    with open(path) as f:
+        doc = json.load(f)
+    if doc.get("version") != BASELINE_VERSION:
+        raise ValueError(f"{path}: unsupported baseline version {doc.get('version')!r}")
+    return doc["results"]
+
+
+def compare(
+    baseline: Dict[str, float], current: Dict[str, float], threshold: float = DEFAULT_THRESHOLD
+) -> Tuple[List[str], List[str]]:
+    """
+    Return (regressions, report_lines). A benchmark regresses when its current
+    time exceeds baseline * (1 + threshold).
+    """
+    regressions: List[str] = []
+    lines: List[str] = []
+    for name in sorted(set(baseline) | set(current)):
+        if name not in current:
+            lines.append(f"{name:40s} missing from this run")
+            continue
+        if name not in baseline:
+            lines.append(f"{name:40s} {current[name]:12.1f} ns (new)")
+            continue
+        old, new = baseline[name], current[name]
+        ratio = new / old if old > 0 else float("inf")
+        flag = ""
+        if ratio > 1 + threshold:
+            regressions.append(name)
+            flag = "  REGRESSION"
+        lines.append(f"{name:40s} {old:12.1f} -> {new:12.1f} ns ({ratio - 1:+.1%}){flag}")
+    return regressions, lines
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(prog="bench_triangle.py", description=__doc__.split("\n")[2])
+    sub = p.add_subparsers(dest="cmd", required=True)
+    run_p = sub.add_parser("run", help="run the suite and optionally save a baseline")
+    run_p.add_argument("-o", "--output", help="write results to this JSON baseline file")
+    cmp_p = sub.add_parser("compare", help="run the suite and compare with a baseline")
+    cmp_p.add_argument("baseline", help="baseline JSON written by 'run -o'")
+    cmp_p.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                       help=f"allowed slowdown as a fraction (default: {DEFAULT_THRESHOLD})")
+    for sp in (run_p, cmp_p):
+        sp.add_argument("--repeat", type=int, default=5, help="timing repeats (best is kept)")
+        sp.add_argument("--min-time", type=float, default=0.2,
+                        help="seconds per latency timing run (default: 0.2)")
+        sp.add_argument("--batch-rows", type=int, default=100_000)
+        sp.add_argument("--sweep-bound", type=int, default=200, help="0 skips the domain sweep")
+        sp.add_argument("--reference-sweep-bound", type=int, default=100,
+                        help="sweep bound for classifyTriangle (default: 100; 0 skips it)")
+    args = p.parse_args(argv)
+
+    results = run_suite(
+        repeat=args.repeat,
+        min_time=args.min_time,
+        batch_rows=args.batch_rows,
+        sweep_bound=args.sweep_bound,
+        reference_sweep_bound=args.reference_sweep_bound,
+    )
+    if args.cmd == "run":
+        for name in sorted(results):
+            print(f"{name:40s} {results[name]:12.1f} ns")
+        if args.output:
+            save_baseline(args.output, results)
+            print(f"baseline written to {args.output}")
+        return 0
+
+    regressions, lines = compare(load_baseline(args.baseline), results, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"{len(regressions)} benchmark(s) regressed past {args.threshold:.0%}: "
+              + ", ".join(regressions))
+        return 1
+    print("no regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
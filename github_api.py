@@ -1,10 +1,24 @@
 # github_api.py
 from __future__ import annotations
 
-from typing import List, Tuple, Optional
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Any, Dict, Iterable, Iterator, List, Tuple, Optional
+from urllib.parse import parse_qs, urlparse
+import itertools
 import os
 import time
 import requests
+from requests.adapters import HTTPAdapter
+
+from github_cache import CachingAdapter, ResponseCache
+from github_ratelimit import RateLimitScheduler, default_scheduler
+from github_state import SyncState
+
+# per-repo /commits requests made in parallel by list_user_repos_with_commit_counts
+DEFAULT_MAX_WORKERS = 8
+
+# REST base URL; point it at github_fake.FakeGitHubServer for offline runs
+API_URL = os.getenv("GITHUB_API_URL", "https://api.github.com").rstrip("/")
 
 
 class GitHubAPIError(Exception):
@@ -12,12 +26,29 @@ class GitHubAPIError(Exception):
     pass
 
 
-def _new_session() -> requests.Session:
+def _new_session(
+    pool_size: int = DEFAULT_MAX_WORKERS,
+    cache: Optional[ResponseCache] = None,
+) -> requests.Session:
     """
     Create a requests session with sensible headers and optional token.
+    The connection pool holds pool_size keep-alive connections so concurrent
+    requests from worker threads reuse them instead of reconnecting.
+    With a ResponseCache (or a GITHUB_API_CACHE=<sqlite file> env var) GETs
+    are sent as conditional requests and 304s are served from the cache.
     Kept separate so tests can patch it.
     """
     s = requests.Session()
+    pool = {"pool_connections": 1, "pool_maxsize": max(1, pool_size)}
+    cache_path = os.getenv("GITHUB_API_CACHE")  # optional, saves rate limit
+    if cache is not None:
+        adapter: HTTPAdapter = CachingAdapter(cache, **pool)
+    elif cache_path:
+        adapter = CachingAdapter(ResponseCache(cache_path), close_cache=True, **pool)
+    else:
+        adapter = HTTPAdapter(**pool)
+    s.mount("https://", adapter)
+    s.mount("http://", adapter)
     s.headers.update({
         "User-Agent": "ssw-567-hw-github-client",
         "Accept": "application/vnd.github+json",
@@ -57,64 +88,321 @@ def _raise_if_error(resp: requests.Response, *, allow_409_empty: bool = False) -
     raise GitHubAPIError(f"GitHub API error {resp.status_code}{extra}: {body}")
 
 
+def _parse_links(resp: requests.Response) -> Dict[str, str]:
+    """
+    Parse a Link header ('<url>; rel="next", <url>; rel="last"') into {rel: url}.
+    Missing or malformed headers give an empty dict.
+    """
+    header = (getattr(resp, "headers", None) or {}).get("Link") or ""
+    links: Dict[str, str] = {}
+    for part in header.split(","):
+        url_part, _, params = part.partition(";")
+        url = url_part.strip()
+        if not (url.startswith("<") and url.endswith(">")):
+            continue
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "rel":
+                for rel in value.strip('"').split():
+                    links[rel] = url[1:-1]
+    return links
+
+
+def _page_number(url: str) -> Optional[int]:
+    """The ?page=N query parameter of a pagination URL, if any."""
+    try:
+        return int(parse_qs(urlparse(url).query)["page"][0])
+    except (KeyError, IndexError, ValueError):
+        return None
+
+
+def _iter_pages(
+    session: requests.Session, url: str, scheduler: RateLimitScheduler
+) -> Iterator[Any]:
+    """Yield the JSON body of url and of every page reached by following rel="next"."""
+    seen = set()
+    next_url: Optional[str] = url
+    while next_url and next_url not in seen:
+        seen.add(next_url)
+        r = scheduler.get(session, next_url, timeout=20)
+        _raise_if_error(r)
+        yield r.json()
+        next_url = _parse_links(r).get("next")
+
+
+def _fetch_commit_count(
+    session: requests.Session, user: str, name: str, scheduler: RateLimitScheduler
+) -> int:
+    """
+    Exact commit count for one repo from a single one-commit page: with
+    per_page=1 the rel="last" page number in the Link header is the total.
+    Without a Link header (0 or 1 commits) the body is counted instead.
+    409 ('Git Repository is empty') counts as zero.
+    """
+    commits_url = f"{API_URL}/repos/{user}/{name}/commits?per_page=1"
+    c = scheduler.get(session, commits_url, timeout=20)
+    _raise_if_error(c, allow_409_empty=True)
+
+    if c.status_code == 409:
+        return 0
+    last = _parse_links(c).get("last")
+    if last:
+        total = _page_number(last)
+        if total is not None:
+            return total
+    commits = c.json()
+    return len(commits) if isinstance(commits, list) else 0
+
+
+def _iter_commit_counts(
+    session: requests.Session,
+    user: str,
+    names: List[str],
+    max_workers: int,
+    scheduler: RateLimitScheduler,
+) -> Iterator[Tuple[str, int]]:
+    """
+    Yield (name, commit_count) for names as each request completes, using up to
+    max_workers threads on one session. The first GitHubAPIError cancels every
+    request that has not started yet and is re-raised; so does closing the
+    generator early.
+    """
+    if max_workers <= 1 or len(names) <= 1:
+        for name in names:
+            yield name, _fetch_commit_count(session, user, name, scheduler)
+        return
+
+    pool = ThreadPoolExecutor(max_workers=min(max_workers, len(names)))
+    futures = {
+        pool.submit(_fetch_commit_count, session, user, name, scheduler): name for name in names
+    }
+    try:
+        for fut in as_completed(futures):
+            yield futures[fut], fut.result()
+    finally:
+        for fut in futures:
+            fut.cancel()
+        # don't wait for requests already in flight when failing fast
+        pool.shutdown(wait=False)
+
+
+BACKENDS = ("auto", "rest", "graphql")
+
+
+def _pick_backend(backend: str, session: requests.Session) -> str:
+    """'auto' means GraphQL for an authenticated session (it needs a token), else REST."""
+    if backend not in BACKENDS:
+        raise ValueError(f"backend must be one of {BACKENDS}, got {backend!r}")
+    if backend == "auto":
+        authed = isinstance(session, requests.Session) and "Authorization" in session.headers
+        return "graphql" if authed else "rest"
+    return backend
+
+
+def iter_repos_with_commit_counts(
+    user: str,
+    session: Optional[requests.Session] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    state: Optional[SyncState] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
+    backend: str = "auto",
+) -> Iterator[Tuple[str, int]]:
+    """
+    Yield (repo_name, commit_count) for the given GitHub user as soon as each
+    count is known (unordered). Same options and errors as
+    list_user_repos_with_commit_counts; with a SyncState the state is only
+    updated once the generator has been fully consumed.
+    """
+    if scheduler is None:
+        scheduler = default_scheduler()
+    close_session = False
+    if session is None:
+        session = _new_session(max_workers)
+        close_session = True
+
+    try:
+        pushed: Dict[str, Optional[str]] = {}
+        counts: Dict[str, int] = {}
+
+        if _pick_backend(backend, session) == "graphql":
+            from github_graphql import iter_repo_pages  # imports this module
+
+            # counts come with the listing: nothing to skip in incremental mode
+            for page in iter_repo_pages(user, session, scheduler):
+                for name, pushed_at, count in page:
+                    pushed[name] = pushed_at
+                    counts[name] = count
+                    yield name, count
+        else:
+            # list repos (all pages)
+            repos_url = f"{API_URL}/users/{user}/repos?per_page=100"
+            for page in _iter_pages(session, repos_url, scheduler):
+                for repo in page or []:
+                    name = repo.get("name")
+                    if name:
+                        pushed[name] = repo.get("pushed_at") or repo.get("updated_at")
+
+            previous = state.load(user) if state is not None else {}
+            for name, pushed_at in pushed.items():
+                old = previous.get(name)
+                if old is not None and pushed_at is not None and old[0] == pushed_at:
+                    counts[name] = old[1]
+                    yield name, old[1]
+
+            stale = [name for name in pushed if name not in counts]
+            for name, count in _iter_commit_counts(session, user, stale, max_workers, scheduler):
+                counts[name] = count
+                yield name, count
+
+        if state is not None:
+            state.replace(user, {name: (pushed[name], count) for name, count in counts.items()})
+    finally:
+        if close_session and hasattr(session, "close"):
+            session.close()
+
+
 def list_user_repos_with_commit_counts(
     user: str,
-    session: Optional[requests.Session] = None
+    session: Optional[requests.Session] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    state: Optional[SyncState] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
+    backend: str = "auto",
 ) -> List[Tuple[str, int]]:
     """
     Return a list of (repo_name, commit_count) for the given GitHub user.
+    - Every page of the user's repos is listed (Link rel="next").
+    - Commit counts are exact, one small request per repo (see _fetch_commit_count).
+    - Commit counts are fetched with up to max_workers concurrent requests
+      (max_workers=1 fetches them one after another).
+    - With a SyncState (incremental mode), repos whose pushed_at is unchanged
+      since the last sync reuse the stored count and are not queried; the
+      state is updated (deleted repos dropped) only after a successful sync.
+    - backend "rest" lists repos and queries /commits per repo; "graphql"
+      (see github_graphql) gets 100 repos with exact counts per request;
+      "auto" uses GraphQL when the session carries a token.
+    - Every request goes through scheduler (default: the shared
+      default_scheduler()), which paces against the rate limit and retries
+      5xx / connection errors / Retry-After responses.
     - On commits endpoint, 409 ('Git Repository is empty') is treated as zero.
-    - Any other non-200 raises GitHubAPIError.
+    - Any other non-200 raises GitHubAPIError; the first one cancels the rest.
     Results are sorted by repo name (case-insensitive).
     """
+    results = list(
+        iter_repos_with_commit_counts(user, session, max_workers, state, scheduler, backend)
+    )
+    results.sort(key=lambda t: t[0].lower())
+    return results
+
+
+def iter_users(lines: Iterable[str]) -> Iterator[str]:
+    """
+    Clean a stream of user names: strip blanks and '#' comments, and drop
+    case-insensitive duplicates (GitHub logins are case-insensitive).
+    """
+    seen = set()
+    for line in lines:
+        user = line.strip()
+        if not user or user.startswith("#") or user.lower() in seen:
+            continue
+        seen.add(user.lower())
+        yield user
+
+
+def iter_bulk_repos_with_commit_counts(
+    users: Iterable[str],
+    session: Optional[requests.Session] = None,
+    max_workers: int = DEFAULT_MAX_WORKERS,
+    state: Optional[SyncState] = None,
+    scheduler: Optional[RateLimitScheduler] = None,
+    backend: str = "auto",
+) -> Iterator[Dict[str, Any]]:
+    """
+    Sweep many users over one shared session (one keep-alive connection pool
+    sized for max_workers), yielding a record per repo as it completes:
+      {"user": ..., "repo": ..., "commits": ...}
+    A user whose sweep fails yields {"user": ..., "error": ...} and the sweep
+    moves on. Users are deduplicated with iter_users.
+    """
     close_session = False
     if session is None:
-        session = _new_session()
+        session = _new_session(max_workers)
         close_session = True
-
     try:
-        # list repos
-        repos_url = f"https://api.github.com/users/{user}/repos?per_page=100"
-        r = session.get(repos_url, timeout=20)
-        _raise_if_error(r)
-        repos = r.json() or []
+        for user in iter_users(users):
+            try:
+                for name, count in iter_repos_with_commit_counts(
+                    user, session, max_workers, state, scheduler, backend
+                ):
+                    yield {"user": user, "repo": name, "commits": count}
+            except GitHubAPIError as e:
+                yield {"user": user, "error": str(e)}
+    finally:
+        if close_session and hasattr(session, "close"):
+            session.close()
 
-        results: List[Tuple[str, int]] = []
-        for repo in repos:
-            name = repo.get("name")
-            if not name:
-                continue
 
-            commits_url = f"https://api.github.com/repos/{user}/{name}/commits?per_page=100"
-            c = session.get(commits_url, timeout=20)
-            _raise_if_error(c, allow_409_empty=True)
+def main(argv: List[str]) -> int:
+    import argparse
+    import json
+    import sys
 
-            if c.status_code == 409:
-                count = 0
-            else:
-                commits = c.json()
-                count = len(commits) if isinstance(commits, list) else 0
+    parser = argparse.ArgumentParser(
+        prog="github_api.py", description="List GitHub users' repos with commit counts."
+    )
+    parser.add_argument("users", nargs="*", metavar="user", help="GitHub user name(s)")
+    parser.add_argument("--users-file", metavar="FILE",
+                        help="read user names from FILE, one per line ('-' for stdin)")
+    parser.add_argument("--jsonl", action="store_true",
+                        help="stream one JSON object per repo (implied for several users)")
+    parser.add_argument("--workers", type=int, default=DEFAULT_MAX_WORKERS,
+                        help=f"concurrent requests (default: {DEFAULT_MAX_WORKERS})")
+    parser.add_argument("--backend", choices=BACKENDS, default="auto",
+                        help="rest, graphql (needs GITHUB_TOKEN), or auto (default: graphql "
+                             "when a token is set)")
+    parser.add_argument("--state", metavar="FILE",
+                        help="incremental mode: only re-count repos pushed since the last "
+                             "run recorded in this state file")
+    args = parser.parse_args(argv)
+    if not args.users and not args.users_file:
+        parser.error("give at least one user or --users-file")
 
-            results.append((name, count))
+    state = SyncState(args.state) if args.state else None
+    try:
+        if len(args.users) == 1 and not args.users_file and not args.jsonl:
+            try:
+                rows = list_user_repos_with_commit_counts(
+                    args.users[0], max_workers=args.workers, state=state, backend=args.backend
+                )
+            except GitHubAPIError as e:
+                print(e)
+                return 1
+            for name, cnt in rows:
+                print(f"Repo: {name}  Number of commits: {cnt}")
+            return 0
 
-        results.sort(key=lambda t: t[0].lower())
-        return results
+        users: Iterable[str] = args.users
+        users_file = None
+        if args.users_file:
+            users_file = sys.stdin if args.users_file == "-" else open(args.users_file)
+            users = itertools.chain(args.users, users_file)
+        failed = False
+        try:
+            for record in iter_bulk_repos_with_commit_counts(
+                users, max_workers=args.workers, state=state, backend=args.backend
+            ):
+                failed = failed or "error" in record
+                sys.stdout.write(json.dumps(record) + "\n")
+                sys.stdout.flush()
+        finally:
+            if users_file is not None and users_file is not sys.stdin:
+                users_file.close()
+        return 1 if failed else 0
     finally:
-        if close_session and hasattr(session, "close"):
-            session.close()
+        if state is not None:
+            state.close()
 
 
 if __name__ == "__main__":
     import sys
-    if len(sys.argv) != 2:
-        print("Usage: python github_api.py <github_user>")
-        sys.exit(2)
-
-    user = sys.argv[1]
-    try:
-        rows = list_user_repos_with_commit_counts(user)
-        for name, cnt in rows:
-            print(f"Repo: {name}  Number of commits: {cnt}")
-    except GitHubAPIError as e:
-        print(e)
-        sys.exit(1)
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,201 @@
+# github_cache.py
+"""
+Persistent ETag / Last-Modified cache for the GitHub client.
+
+CachingAdapter is a requests HTTPAdapter that turns every GET into a
+conditional request (If-None-Match / If-Modified-Since) when it has a stored
+copy of the URL, and serves the stored body when GitHub answers 304 Not
+Modified. GitHub does not count 304s against the rate limit.
+
+Responses are stored in a SQLite file, so several processes can share one
+cache safely (WAL mode, busy timeout). Entries are evicted by age and by
+total body size, least recently used first.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+DEFAULT_MAX_AGE = 30 * 24 * 3600  # seconds
+
+# headers worth replaying from the cached copy on a 304
+_STORED_HEADERS = ("Content-Type", "ETag", "Last-Modified", "Link")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS responses (
+    key           TEXT PRIMARY KEY,
+    url           TEXT NOT NULL,
+    etag          TEXT,
+    last_modified TEXT,
+    headers       TEXT NOT NULL,
+    body          BLOB NOT NULL,
+    size          INTEGER NOT NULL,
+    stored_at     REAL NOT NULL,
+    last_used     REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS responses_last_used ON responses (last_used);
+"""
+
+
+class ResponseCache:
+    """SQLite-backed store of validators + bodies, keyed per URL and credentials."""
+
+    def __init__(
+        self,
+        path: str,
+        *,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        max_age: float = DEFAULT_MAX_AGE,
+    ):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_age = max_age
+        self.hits = 0          # 304 answered from the cache
+        self.misses = 0        # no usable cached copy, or the resource changed
+        self.stores = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    @staticmethod
+    def key_for(request: requests.PreparedRequest) -> str:
+        # the token is part of the key: different credentials can see different data
+        h = request.headers
+        raw = "\n".join((request.url or "", h.get("Accept", ""), h.get("Authorization", "")))
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def lookup(self, key: str) -> Optional[Tuple[Optional[str], Optional[str], Dict[str, str], bytes]]:
+        """(etag, last_modified, headers, body) for key, or None if missing or expired."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT etag, last_modified, headers, body, stored_at FROM responses WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        etag, last_modified, headers, body, stored_at = row
+        if time.time() - stored_at > self.max_age:
+            return None
+        return etag, last_modified, json.loads(headers), bytes(body)
+
+    def mark_hit(self, key: str) -> None:
+        """Count a 304 served from the cache and bump the entry's LRU position."""
+        with self._lock:
+            self.hits += 1
+            self._db.execute("UPDATE responses SET last_used = ? WHERE key = ?", (time.time(), key))
+
+    def mark_miss(self) -> None:
+        with self._lock:
+            self.misses += 1
+
+    def store(self, key: str, resp: requests.Response) -> None:
+        etag = resp.headers.get("ETag")
+        last_modified = resp.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+        body = resp.content or b""
+        if len(body) > self.max_bytes:
+            return
+        headers = {h: resp.headers[h] for h in _STORED_HEADERS if h in resp.headers}
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(key, url, etag, last_modified, headers, body, size, stored_at, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (key, resp.url, etag, last_modified, json.dumps(headers), body, len(body), now, now),
+            )
+            self.stores += 1
+            self._evict(now)
+
+    def _evict(self, now: float) -> None:
+        # caller holds self._lock
+        cur = self._db.execute("DELETE FROM responses WHERE stored_at < ?", (now - self.max_age,))
+        self.evictions += max(0, cur.rowcount)
+        total = self._db.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for key, size in self._db.execute(
+            "SELECT key, size FROM responses ORDER BY last_used ASC"
+        ).fetchall():
+            self._db.execute("DELETE FROM responses WHERE key = ?", (key,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            entries, size = self._db.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses"
+            ).fetchone()
+        lookups = self.hits + self.misses
+        return {
+            "entries": entries,
+            "bytes": size,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+            "stores": self.stores,
+            "evictions": self.evictions,
+        }
+
+
+class CachingAdapter(HTTPAdapter):
+    """HTTPAdapter that revalidates GETs against a ResponseCache."""
+
+    def __init__(self, cache: ResponseCache, *, close_cache: bool = False, **kwargs: Any):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self._close_cache = close_cache
+
+    def close(self) -> None:
+        super().close()
+        if self._close_cache:
+            self.cache.close()
+
+    def send(self, request: requests.PreparedRequest, **kwargs: Any) -> requests.Response:
+        if request.method != "GET":
+            return super().send(request, **kwargs)
+
+        key = self.cache.key_for(request)
+        cached = self.cache.lookup(key)
+        if cached is not None:
+            etag, last_modified, _, _ = cached
+            if etag:
+                request.headers["If-None-Match"] = etag
+            if last_modified:
+                request.headers["If-Modified-Since"] = last_modified
+
+        resp = super().send(request, **kwargs)
+        resp.from_cache = False  # type: ignore[attr-defined]
+
+        if resp.status_code == 304 and cached is not None:
+            _, _, headers, body = cached
+            self.cache.mark_hit(key)
+            resp.status_code = 200
+            resp.reason = "OK (cached)"
+            resp.headers.update(headers)  # keep the fresh rate-limit headers too
+            resp._content = body
+            resp.from_cache = True  # type: ignore[attr-defined]
+            return resp
+
+        self.cache.mark_miss()
+        if resp.status_code == 200:
+            self.cache.store(key, resp)
+        return resp
@@ -0,0 +1,330 @@
+# github_fake.py
+"""
+Offline GitHub for load benchmarks.
+
+FakeGitHubServer replays a cassette recorded by
+github_instrument.CassetteRecorder over local HTTP:
+  - matches requests on (method, path with query, JSON body);
+  - sleeps `latency` seconds per request to model the network round trip
+    (handlers run in threads, so concurrent clients overlap their waits);
+  - sends X-RateLimit-* headers from a budget of `rate_limit` requests per
+    `reset_after` seconds and answers 403 once it is spent;
+  - sends an ETag per response and answers If-None-Match with a free 304, so
+    the github_cache path can be measured too.
+Link headers are rewritten from the recorded API base to the server's URL.
+
+CLI:
+  python github_fake.py record USER -o cassette.json   (needs the network)
+  python github_fake.py serve cassette.json --port 8000 --latency 0.05
+  python github_fake.py bench cassette.json USER --latency 0.05
+bench runs the REST client in serial, concurrent and cached modes against
+the fake server and prints the request stats of each.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+from github_instrument import load_cassette
+
+DEFAULT_RATE_LIMIT = 5000
+DEFAULT_RESET_AFTER = 3600.0  # seconds
+
+_Key = Tuple[str, str, Optional[str]]
+
+
+def _body_key(body: Any) -> Optional[str]:
+    return None if body is None else json.dumps(body, sort_keys=True)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive, like api.github.com
+    disable_nagle_algorithm = True  # headers and body go out in separate writes
+
+    def do_GET(self) -> None:
+        self.server.fake._handle(self)
+
+    def do_POST(self) -> None:
+        self.server.fake._handle(self)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class FakeGitHubServer:
+    """Replays a cassette; use as a context manager or start()/stop()."""
+
+    def __init__(
+        self,
+        cassette: Dict[str, Any],
+        *,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: float = 0.0,
+        rate_limit: int = DEFAULT_RATE_LIMIT,
+        reset_after: float = DEFAULT_RESET_AFTER,
+    ):
+        self.recorded_base = cassette.get("base", "").rstrip("/")
+        self.latency = latency
+        self.rate_limit = rate_limit
+        self.reset_after = reset_after
+        self._lock = threading.Lock()
+        self._remaining = rate_limit
+        self._reset = time.time() + reset_after
+        # identical requests recorded several times are replayed in turn
+        self._routes: Dict[_Key, List[Dict[str, Any]]] = {}
+        self._next: Dict[_Key, int] = {}
+        for it in cassette.get("interactions", []):
+            key = (it["method"].upper(), it["path"], _body_key(it.get("body")))
+            self._routes.setdefault(key, []).append(it)
+        self.requests = 0
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._httpd.fake = self
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeGitHubServer":
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, args=(0.05,), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "FakeGitHubServer":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    # ---------- request handling ----------
+    def _match(self, method: str, path: str, body: Optional[bytes]) -> Optional[Dict[str, Any]]:
+        parsed = None
+        if body:
+            try:
+                parsed = json.loads(body)
+            except ValueError:
+                return None
+        key = (method, path, _body_key(parsed))
+        with self._lock:
+            entries = self._routes.get(key)
+            if not entries:
+                return None
+            i = self._next.get(key, 0)
+            self._next[key] = (i + 1) % len(entries)
+        return entries[i]
+
+    def _charge(self, free: bool) -> Tuple[int, int]:
+        with self._lock:
+            self.requests += 1
+            now = time.time()
+            if now >= self._reset:
+                self._remaining = self.rate_limit
+                self._reset = now + self.reset_after
+            if not free and self._remaining > 0:
+                self._remaining -= 1
+                return self._remaining + 1, int(self._reset)
+            return self._remaining, int(self._reset)
+
+    def _handle(self, h: BaseHTTPRequestHandler) -> None:
+        length = int(h.headers.get("Content-Length") or 0)
+        body = h.rfile.read(length) if length else None
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        it = self._match(h.command, h.path, body)
+        if it is None:
+            status, headers = 404, {"Content-Type": "application/json"}
+            payload = json.dumps({"message": f"Not Found (no cassette entry for {h.command} {h.path})"})
+        else:
+            status, headers, payload = it["status"], dict(it.get("headers") or {}), it.get("response") or ""
+        data = payload.encode()
+        etag = f'W/"{hashlib.sha1(data).hexdigest()}"'
+        not_modified = status == 200 and h.headers.get("If-None-Match") == etag
+
+        # a conditional request answered 304 does not count against the limit
+        before, reset = self._charge(free=not_modified)
+        if before <= 0 and not not_modified:
+            status, headers = 403, {"Content-Type": "application/json"}
+            data = json.dumps({"message": "API rate limit exceeded"}).encode()
+        remaining = max(0, before - 1) if not not_modified else before
+
+        h.send_response(304 if not_modified else status)
+        for name, value in headers.items():
+            if name == "Link" and self.recorded_base:
+                value = value.replace(self.recorded_base, self.url)
+            if name not in ("ETag", "Content-Length"):
+                h.send_header(name, value)
+        if status == 200:
+            h.send_header("ETag", etag)
+        h.send_header("X-RateLimit-Limit", str(self.rate_limit))
+        h.send_header("X-RateLimit-Remaining", str(remaining))
+        h.send_header("X-RateLimit-Reset", str(reset))
+        if not_modified:
+            h.send_header("Content-Length", "0")
+            h.end_headers()
+            return
+        h.send_header("Content-Length", str(len(data)))
+        h.end_headers()
+        h.wfile.write(data)
+
+
+# ---------- benchmark ----------
+def _run_mode(
+    user: str, base: str, workers: int, backend: str, cache_path: Optional[str]
+) -> Dict[str, Any]:
+    import github_api
+    from github_cache import ResponseCache
+    from github_instrument import RequestStats
+    from github_ratelimit import RateLimitScheduler
+
+    stats = RequestStats()
+    sched = RateLimitScheduler()
+    sched.hooks.append(stats)
+    saved = github_api.API_URL
+    github_api.API_URL = base
+    cache = ResponseCache(cache_path) if cache_path else None
+    session = github_api._new_session(pool_size=workers, cache=cache)
+    try:
+        start = time.perf_counter()
+        rows = github_api.list_user_repos_with_commit_counts(
+            user, session=session, max_workers=workers, scheduler=sched, backend=backend
+        )
+        wall = time.perf_counter() - start
+    finally:
+        session.close()
+        if cache is not None:
+            cache.close()
+        github_api.API_URL = saved
+    return {"wall_s": round(wall, 4), "repos": len(rows), **stats.summary()}
+
+
+def bench(
+    cassette: Dict[str, Any],
+    user: str,
+    *,
+    latency: float = 0.0,
+    workers: int = 8,
+    backend: str = "rest",
+    rate_limit: int = DEFAULT_RATE_LIMIT,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Run one sync per mode against a fresh FakeGitHubServer and return
+    {mode: {"wall_s", "repos", **RequestStats.summary()}}:
+      serial      one request at a time
+      concurrent  `workers` requests in flight
+      cached      concurrent, measured on a second pass over a warm ETag cache
+    """
+    import os
+    import tempfile
+
+    results: Dict[str, Dict[str, Any]] = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        cache_path = os.path.join(tmp, "cache.sqlite")
+        for mode, n, cached in (("serial", 1, False), ("concurrent", workers, False),
+                                ("cached", workers, True)):
+            with FakeGitHubServer(cassette, latency=latency, rate_limit=rate_limit) as srv:
+                if cached:
+                    _run_mode(user, srv.url, n, backend, cache_path)  # warm-up pass
+                results[mode] = _run_mode(user, srv.url, n, backend,
+                                          cache_path if cached else None)
+    return results
+
+
+def record(user: str, path: str, *, backend: str = "rest", workers: int = 8) -> int:
+    """Sync user against the real API and write every response to path."""
+    import github_api
+    from github_instrument import CassetteRecorder
+    from github_ratelimit import RateLimitScheduler
+
+    recorder = CassetteRecorder(base=github_api.API_URL)
+    sched = RateLimitScheduler()
+    sched.hooks.append(recorder)
+    session = github_api._new_session(pool_size=workers, cache=None)
+    try:
+        github_api.list_user_repos_with_commit_counts(
+            user, session=session, max_workers=workers, scheduler=sched, backend=backend
+        )
+    finally:
+        session.close()
+    recorder.save(path)
+    return len(recorder.interactions)
+
+
+def main(argv: List[str]) -> int:
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(prog="github_fake.py", description=__doc__.split("\n\n")[0])
+    sub = parser.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("record", help="record a real sync of USER into a cassette")
+    p.add_argument("user")
+    p.add_argument("-o", "--output", required=True, metavar="CASSETTE")
+    p.add_argument("--backend", choices=("rest", "graphql"), default="rest")
+    p.add_argument("--workers", type=int, default=8)
+
+    for name, help_ in (("serve", "serve a cassette until interrupted"),
+                        ("bench", "benchmark serial / concurrent / cached modes")):
+        p = sub.add_parser(name, help=help_)
+        p.add_argument("cassette")
+        if name == "bench":
+            p.add_argument("user")
+            p.add_argument("--workers", type=int, default=8)
+            p.add_argument("--backend", choices=("rest", "graphql"), default="rest")
+            p.add_argument("--json", action="store_true", help="print results as JSON")
+        else:
+            p.add_argument("--host", default="127.0.0.1")
+            p.add_argument("--port", type=int, default=8000)
+        p.add_argument("--latency", type=float, default=0.0, help="seconds per request")
+        p.add_argument("--rate-limit", type=int, default=DEFAULT_RATE_LIMIT)
+
+    args = parser.parse_args(argv)
+    if args.cmd == "record":
+        n = record(args.user, args.output, backend=args.backend, workers=args.workers)
+        print(f"recorded {n} responses to {args.output}", file=sys.stderr)
+        return 0
+
+    cassette = load_cassette(args.cassette)
+    if args.cmd == "serve":
+        srv = FakeGitHubServer(cassette, host=args.host, port=args.port,
+                               latency=args.latency, rate_limit=args.rate_limit)
+        print(f"serving {args.cassette} on {srv.url} (set GITHUB_API_URL={srv.url})",
+              file=sys.stderr)
+        try:
+            srv._httpd.serve_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            srv._httpd.server_close()
+        return 0
+
+    results = bench(cassette, args.user, latency=args.latency, workers=args.workers,
+                    backend=args.backend, rate_limit=args.rate_limit)
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return 0
+    print(f"{'mode':<11} {'wall s':>8} {'reqs':>5} {'p50 ms':>8} {'p99 ms':>8} "
+          f"{'bytes':>9} {'hits':>5}")
+    for mode, r in results.items():
+        print(f"{mode:<11} {r['wall_s']:>8} {r['requests']:>5} {r['latency_ms']['p50']:>8} "
+              f"{r['latency_ms']['p99']:>8} {r['bytes']:>9} {r['cache']['hits']:>5}")
+    return 0
+
+
+if __name__ == "__main__":
+    import sys
+
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,147 @@
+# github_instrument.py
+"""
+Request instrumentation for the GitHub client.
+
+RateLimitScheduler calls each of its hooks with a RequestEvent after every
+HTTP round trip (retries included). Two hooks are provided:
+
+  RequestStats       latency percentiles, bytes, status codes, retries and
+                     cache hits/misses, with a summary report
+  CassetteRecorder   captures the responses into a cassette file that
+                     github_fake.FakeGitHubServer can replay offline
+
+Example:
+  stats = RequestStats()
+  sched = RateLimitScheduler()
+  sched.hooks.append(stats)
+  list_user_repos_with_commit_counts("octocat", scheduler=sched)
+  print(stats.format_summary())
+"""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+from urllib.parse import urlsplit
+
+from latency_stats import percentile
+
+CASSETTE_VERSION = 1
+DEFAULT_BASE = "https://api.github.com"
+
+# response headers worth keeping in a cassette
+_RECORDED_HEADERS = ("Content-Type", "Link", "ETag", "Last-Modified")
+
+
+@dataclass(frozen=True)
+class RequestEvent:
+    method: str
+    url: str
+    status: Optional[int]          # None when the request raised
+    latency: float                 # seconds
+    bytes: int                     # response body size
+    attempt: int                   # 0 for the first try, >0 for retries
+    from_cache: Optional[bool]     # None when no response cache is mounted
+    error: Optional[str] = None
+    request_json: Any = None
+    response: Any = field(default=None, repr=False, compare=False)
+
+
+class RequestStats:
+    """Thread-safe aggregate of RequestEvents."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.events: List[RequestEvent] = []
+
+    def __call__(self, event: RequestEvent) -> None:
+        with self._lock:
+            self.events.append(event)
+
+    def summary(self) -> Dict[str, Any]:
+        with self._lock:
+            events = list(self.events)
+        latencies = sorted(e.latency for e in events)
+        statuses: Dict[str, int] = {}
+        for e in events:
+            key = str(e.status) if e.status is not None else "error"
+            statuses[key] = statuses.get(key, 0) + 1
+        return {
+            "requests": len(events),
+            "retries": sum(1 for e in events if e.attempt > 0),
+            "errors": sum(1 for e in events if e.error),
+            "status": statuses,
+            "bytes": sum(e.bytes for e in events),
+            "latency_ms": {
+                "mean": round(sum(latencies) / len(latencies) * 1000, 3) if latencies else 0.0,
+                **{f"p{p}": round(percentile(latencies, p) * 1000, 3) for p in (50, 90, 99)},
+                "max": round(latencies[-1] * 1000, 3) if latencies else 0.0,
+            },
+            "cache": {
+                "hits": sum(1 for e in events if e.from_cache is True),
+                "misses": sum(1 for e in events if e.from_cache is False),
+            },
+        }
+
+    def format_summary(self) -> str:
+        s = self.summary()
+        lat = s["latency_ms"]
+        status = ", ".join(f"{k}: {v}" for k, v in sorted(s["status"].items()))
+        return (
+            f"requests: {s['requests']} (retries: {s['retries']}, errors: {s['errors']})\n"
+            f"status:   {status or '-'}\n"
+            f"bytes:    {s['bytes']}\n"
+            f"latency:  mean {lat['mean']} ms, p50 {lat['p50']} ms, p90 {lat['p90']} ms, "
+            f"p99 {lat['p99']} ms, max {lat['max']} ms\n"
+            f"cache:    {s['cache']['hits']} hits, {s['cache']['misses']} misses"
+        )
+
+
+class CassetteRecorder:
+    """Hook that records every response; save() writes the cassette file."""
+
+    def __init__(self, base: str = DEFAULT_BASE) -> None:
+        self.base = base.rstrip("/")
+        self._lock = threading.Lock()
+        self.interactions: List[Dict[str, Any]] = []
+
+    def _path(self, url: str) -> str:
+        if url.startswith(self.base):
+            return url[len(self.base):] or "/"
+        parts = urlsplit(url)
+        return parts.path + (f"?{parts.query}" if parts.query else "")
+
+    def __call__(self, event: RequestEvent) -> None:
+        resp = event.response
+        if resp is None or event.status is None:
+            return
+        headers = getattr(resp, "headers", None) or {}
+        interaction = {
+            "method": event.method,
+            "path": self._path(event.url),
+            "body": event.request_json,
+            "status": event.status,
+            "headers": {h: headers[h] for h in _RECORDED_HEADERS if h in headers},
+            "response": getattr(resp, "text", ""),
+        }
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self, path: str) -> None:
+        with self._lock:
+            doc = {"version": CASSETTE_VERSION, "base": self.base, "interactions": self.interactions}
+        tmp = f"{path}.tmp{os.getpid()}"
+        with open(tmp, "w") as f:
+            json.dump(doc, f, indent=1)
+            f.write("\n")
+        os.replace(tmp, path)
+
+
+def load_cassette(path: str) -> Dict[str, Any]:
+    with open(path) as f:
+        doc = json.load(f)
+    if doc.get("version") != CASSETTE_VERSION:
+        raise ValueError(f"{path}: unsupported cassette version {doc.get('version')!r}")
+    return doc
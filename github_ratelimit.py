@@ -0,0 +1,326 @@
+# github_ratelimit.py
+"""
+Rate-limit-aware request scheduler for the GitHub client.
+
+Every request made through RateLimitScheduler.get() / post():
+  - waits for its slot: requests go out at full speed until the remaining
+    budget (X-RateLimit-Remaining, less the requests still in flight) drops
+    below pace_fraction of X-RateLimit-Limit; from there they are spaced
+    evenly over the time left until X-RateLimit-Reset, and once it reaches
+    zero they wait for the reset;
+  - updates the budget from the response headers;
+  - is retried, with jittered exponential backoff, on 5xx responses and on
+    connection errors / timeouts;
+  - on 429 / 403 rate-limit responses honors Retry-After (or waits for the
+    reset time / a minute for secondary limits) and then retries.
+
+After every round trip each callable in .hooks gets a
+github_instrument.RequestEvent (latency, bytes, status, retry attempt,
+cache outcome).
+
+GitHub meters REST, GraphQL and search in separate buckets
+(X-RateLimit-Resource), so the budget and pacing are tracked per bucket;
+an exhausted GraphQL budget does not hold up REST calls or vice versa.
+
+Rate limits are per token, so one scheduler should be shared by every request
+of a process; default_scheduler() returns such a shared instance.
+"""
+from __future__ import annotations
+
+import email.utils
+import random
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlsplit
+
+import requests
+
+from github_instrument import RequestEvent
+
+DEFAULT_MAX_RETRIES = 4
+DEFAULT_BACKOFF_BASE = 0.5   # seconds
+DEFAULT_BACKOFF_CAP = 30.0   # seconds
+DEFAULT_MAX_WAIT = 3900.0    # seconds; a primary-limit reset is at most an hour away
+DEFAULT_PACE_FRACTION = 0.05  # start spreading requests when under 5% of the limit remains
+SECONDARY_LIMIT_WAIT = 60.0  # GitHub: wait at least a minute without Retry-After
+
+_RETRY_STATUSES = frozenset((500, 502, 503, 504))
+_sleep = time.sleep  # module-level so tests can patch it
+
+
+def _retry_after_seconds(value: Optional[str], now: float) -> Optional[float]:
+    """Parse a Retry-After header (delta seconds or HTTP date)."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, email.utils.parsedate_to_datetime(value).timestamp() - now)
+    except (TypeError, ValueError):
+        return None
+
+
+def _resource_for(url: str) -> str:
+    """The X-RateLimit-Resource bucket a request to url is charged to."""
+    path = urlsplit(url).path
+    if path.rstrip("/").endswith("/graphql"):
+        return "graphql"
+    if path.startswith("/search/"):
+        return "search"
+    return "core"
+
+
+def _int_header(resp: Any, name: str) -> Optional[int]:
+    try:
+        return int((getattr(resp, "headers", None) or {}).get(name))
+    except (TypeError, ValueError):
+        return None
+
+
+class _Budget:
+    """One rate-limit window as last reported by the API."""
+
+    __slots__ = ("limit", "remaining", "reset", "in_flight", "next_slot")
+
+    def __init__(self) -> None:
+        self.limit: Optional[int] = None
+        self.remaining: Optional[int] = None   # last X-RateLimit-Remaining seen
+        self.reset: Optional[float] = None     # epoch seconds
+        self.in_flight = 0                     # sent, response not seen yet
+        self.next_slot = 0.0                   # pacing
+
+
+class RateLimitScheduler:
+    """Thread-safe pacing + retry policy shared by all GitHub requests."""
+
+    def __init__(
+        self,
+        *,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff_base: float = DEFAULT_BACKOFF_BASE,
+        backoff_cap: float = DEFAULT_BACKOFF_CAP,
+        max_wait: float = DEFAULT_MAX_WAIT,
+        pace_fraction: float = DEFAULT_PACE_FRACTION,
+        clock: Callable[[], float] = time.time,
+        sleep: Optional[Callable[[float], None]] = None,
+    ):
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_cap = backoff_cap
+        self.max_wait = max_wait
+        self.pace_fraction = pace_fraction
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._budgets: Dict[str, _Budget] = {}  # by X-RateLimit-Resource
+        self._paused_until = 0.0               # Retry-After / secondary limit
+        self.retries = 0
+        self.waited = 0.0
+        self.hooks: List[Callable[[RequestEvent], None]] = []
+
+    # ---------- budget ----------
+    def _bucket(self, resource: str) -> _Budget:
+        # caller holds self._lock
+        b = self._budgets.get(resource)
+        if b is None:
+            b = self._budgets[resource] = _Budget()
+        return b
+
+    def budget(self, resource: str = "core") -> Dict[str, Any]:
+        """The last seen budget of one rate-limit resource and scheduler counters."""
+        with self._lock:
+            b = self._bucket(resource)
+            return {
+                "limit": b.limit,
+                "remaining": b.remaining,
+                "reset": b.reset,
+                "in_flight": b.in_flight,
+                "paused_until": self._paused_until or None,
+                "retries": self.retries,
+                "waited_s": round(self.waited, 3),
+            }
+
+    def update(self, resp: Any, resource: str = "core") -> None:
+        """
+        Record X-RateLimit-* headers from any response; the bucket is the
+        response's X-RateLimit-Resource, else resource.
+        """
+        limit = _int_header(resp, "X-RateLimit-Limit")
+        remaining = _int_header(resp, "X-RateLimit-Remaining")
+        reset = _int_header(resp, "X-RateLimit-Reset")
+        resource = (getattr(resp, "headers", None) or {}).get("X-RateLimit-Resource") or resource
+        with self._lock:
+            b = self._bucket(resource)
+            if reset is not None and b.reset is not None:
+                if reset < b.reset:
+                    return  # a late response from an earlier window
+                if reset > b.reset:
+                    b.next_slot = 0.0
+            if limit is not None:
+                b.limit = limit
+            if reset is not None:
+                b.reset = float(reset)
+            if remaining is not None:
+                # the header is authoritative, so it may go up as well as down
+                # (304s are free); requests still in flight count in in_flight
+                b.remaining = remaining
+
+    def pause(self, seconds: float) -> None:
+        """Hold every request for seconds (e.g. Retry-After)."""
+        with self._lock:
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    # ---------- pacing ----------
+    def _delay_for_next(self, resource: str) -> float:
+        # caller holds self._lock; returns how long this request must wait and
+        # counts it as in flight until _release()
+        now = self._clock()
+        start = max(now, self._paused_until)
+        b = self._bucket(resource)
+        if b.remaining is not None and b.reset is not None and b.reset > now:
+            left = b.remaining - b.in_flight
+            if b.remaining <= 0:
+                start = max(start, b.reset)
+            elif b.limit and left < b.limit * self.pace_fraction:
+                interval = (b.reset - now) / max(1, left)
+                start = max(start, b.next_slot)
+                b.next_slot = start + interval
+        b.in_flight += 1
+        return start - now
+
+    def _release(self, resource: str) -> None:
+        with self._lock:
+            self._bucket(resource).in_flight -= 1
+
+    def _wait(self, seconds: float) -> bool:
+        if seconds <= 0:
+            return True
+        if seconds > self.max_wait:
+            return False
+        with self._lock:
+            self.waited += seconds
+        (self._sleep or _sleep)(seconds)
+        return True
+
+    def _backoff(self, attempt: int) -> float:
+        # "full jitter": uniform over [0, min(cap, base * 2**attempt)]
+        return random.uniform(0, min(self.backoff_cap, self.backoff_base * (2 ** attempt)))
+
+    # ---------- requests ----------
+    def get(self, session: requests.Session, url: str, **kwargs: Any) -> requests.Response:
+        """session.get(url, **kwargs) with pacing, rate-limit waits and retries."""
+        return self.request(session, "GET", url, **kwargs)
+
+    def post(self, session: requests.Session, url: str, **kwargs: Any) -> requests.Response:
+        """session.post(url, **kwargs) for idempotent POSTs (GraphQL queries)."""
+        return self.request(session, "POST", url, **kwargs)
+
+    def request(
+        self, session: requests.Session, method: str, url: str, **kwargs: Any
+    ) -> requests.Response:
+        """session.<method>(url, **kwargs) with pacing, rate-limit waits and retries."""
+        send = getattr(session, method.lower())
+        resource = _resource_for(url)
+        attempt = 0
+        while True:
+            with self._lock:
+                delay = self._delay_for_next(resource)
+            start = time.perf_counter()
+            try:
+                self._wait(delay)  # over max_wait: go anyway and let the API answer
+                start = time.perf_counter()
+                resp = send(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                self._release(resource)
+                self._emit(method, url, None, start, attempt, kwargs, error=e)
+                if attempt >= self.max_retries:
+                    raise
+                self._count_retry()
+                self._wait(self._backoff(attempt))
+                attempt += 1
+                continue
+            except BaseException:
+                self._release(resource)
+                raise
+
+            self._emit(method, url, resp, start, attempt, kwargs)
+            self.update(resp, resource)
+            self._release(resource)
+            wait = self._retry_wait(resp, attempt)
+            if wait is None or attempt >= self.max_retries or not self._wait(wait):
+                return resp
+            self._count_retry()
+            attempt += 1
+
+    def _emit(
+        self,
+        method: str,
+        url: str,
+        resp: Any,
+        start: float,
+        attempt: int,
+        kwargs: Dict[str, Any],
+        error: Optional[BaseException] = None,
+    ) -> None:
+        if not self.hooks:
+            return
+        content = getattr(resp, "content", b"") if resp is not None else b""
+        event = RequestEvent(
+            method=method,
+            url=url,
+            status=getattr(resp, "status_code", None) if resp is not None else None,
+            latency=time.perf_counter() - start,
+            bytes=len(content) if isinstance(content, (bytes, bytearray)) else 0,
+            attempt=attempt,
+            from_cache=getattr(resp, "from_cache", None) if resp is not None else None,
+            error=repr(error) if error is not None else None,
+            request_json=kwargs.get("json"),
+            response=resp,
+        )
+        for hook in self.hooks:
+            hook(event)
+
+    def _count_retry(self) -> None:
+        with self._lock:
+            self.retries += 1
+
+    def _retry_wait(self, resp: Any, attempt: int) -> Optional[float]:
+        """Seconds to wait before retrying resp, or None if it should be returned."""
+        status = getattr(resp, "status_code", 200)
+        if status in _RETRY_STATUSES:
+            return self._backoff(attempt)
+        if status not in (403, 429):
+            return None
+
+        now = self._clock()
+        retry_after = _retry_after_seconds(
+            (getattr(resp, "headers", None) or {}).get("Retry-After"), now
+        )
+        if retry_after is not None:
+            self.pause(retry_after)
+            return retry_after
+        if _int_header(resp, "X-RateLimit-Remaining") == 0:
+            reset = _int_header(resp, "X-RateLimit-Reset")
+            if reset is not None:
+                return max(0.0, reset - now) + 1.0
+        if status == 429 or "secondary rate limit" in (getattr(resp, "text", "") or "").lower():
+            wait = SECONDARY_LIMIT_WAIT * (2 ** attempt)
+            self.pause(wait)
+            return wait
+        return None  # a plain 403 (e.g. forbidden repo)
+
+
+_default: Optional[RateLimitScheduler] = None
+_default_lock = threading.Lock()
+
+
+def default_scheduler() -> RateLimitScheduler:
+    """The process-wide scheduler used when a caller does not pass one."""
+    global _default
+    with _default_lock:
+        if _default is None:
+            _default = RateLimitScheduler()
+        return _default
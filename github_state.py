@@ -0,0 +1,74 @@
+# github_state.py
+"""
+Local state store for incremental syncs of repo commit counts.
+
+For every (user, repo) it remembers the repo's pushed_at timestamp from the
+last sync and the commit count fetched then. A repo whose pushed_at has not
+changed cannot have new commits, so its stored count is reused instead of
+querying /commits again.
+
+Stored in a SQLite file (WAL mode) so concurrent sweeps can share it.
+"""
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS repo_state (
+    user         TEXT NOT NULL,
+    repo         TEXT NOT NULL,
+    pushed_at    TEXT,
+    commit_count INTEGER NOT NULL,
+    synced_at    REAL NOT NULL,
+    PRIMARY KEY (user, repo)
+);
+"""
+
+
+class SyncState:
+    """Per-user snapshot of {repo: (pushed_at, commit_count)}."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(path, timeout=30, check_same_thread=False,
+                                   isolation_level=None)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript(_SCHEMA)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def load(self, user: str) -> Dict[str, Tuple[Optional[str], int]]:
+        """The last synced {repo: (pushed_at, commit_count)} for user."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT repo, pushed_at, commit_count FROM repo_state WHERE user = ?",
+                (user.lower(),),
+            ).fetchall()
+        return {repo: (pushed_at, count) for repo, pushed_at, count in rows}
+
+    def replace(self, user: str, repos: Dict[str, Tuple[Optional[str], int]]) -> None:
+        """
+        Atomically make repos the user's whole state; repos that are no longer
+        listed (deleted, renamed, made private) are dropped.
+        """
+        now = time.time()
+        key = user.lower()
+        with self._lock:
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                self._db.execute("DELETE FROM repo_state WHERE user = ?", (key,))
+                self._db.executemany(
+                    "INSERT INTO repo_state (user, repo, pushed_at, commit_count, synced_at) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    [(key, repo, pushed_at, count, now) for repo, (pushed_at, count) in repos.items()],
+                )
+            except BaseException:
+                self._db.execute("ROLLBACK")
+                raise
+            self._db.execute("COMMIT")
@@ -0,0 +1,16 @@
+# latency_stats.py
+"""
+Latency summary helpers shared by triangle_service (/stats) and
+github_instrument (RequestStats). Stdlib only, so importing it is cheap.
+"""
+from __future__ import annotations
+
+from typing import Sequence
+
+
+def percentile(sorted_values: Sequence[float], pct: float) -> float:
+    """Nearest-rank percentile of already sorted values (0.0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    i = min(len(sorted_values) - 1, int(round(pct / 100 * (len(sorted_values) - 1))))
+    return sorted_values[i]
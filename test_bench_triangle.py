@@ -0,0 +1,46 @@
+# test_bench_triangle.py
+import os
+import tempfile
+import unittest
+
+import bench_triangle
+from bench_triangle import compare, load_baseline, run_suite, save_baseline
+
+
+class BenchTriangleTests(unittest.TestCase):
+    def test_compare_flags_only_regressions_past_threshold(self):
+        baseline = {"a": 100.0, "b": 100.0, "gone": 5.0}
+        current = {"a": 124.0, "b": 126.0, "new": 1.0}
+        regressions, lines = compare(baseline, current, threshold=0.25)
+        self.assertEqual(regressions, ["b"])
+        text = "\n".join(lines)
+        self.assertIn("missing from this run", text)
+        self.assertIn("(new)", text)
+
+    def test_baseline_round_trip(self):
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "bench.json")
+            save_baseline(path, {"latency.x": 12.5})
+            self.assertEqual(load_baseline(path), {"latency.x": 12.5})
+
+    def test_small_suite_covers_every_category(self):
+        results = run_suite(repeat=1, min_time=0.001, batch_rows=200, sweep_bound=5)
+        for category in bench_triangle.CATEGORIES:
+            self.assertIn(f"latency.classifyTriangle.{category}", results)
+            self.assertIn(f"latency.classify_code.{category}", results)
+        for func in ("classifyTriangle", "classify_code"):
+            self.assertIn(f"batch.{func}", results)
+            self.assertIn(f"sweep.{func}", results)
+        self.assertTrue(all(v > 0 for v in results.values()))
+
+    @unittest.skipUnless(os.getenv("TRIANGLE_BENCH_BASELINE"), "set TRIANGLE_BENCH_BASELINE to gate")
+    def test_no_regression_against_baseline(self):
+        """Opt-in gate: TRIANGLE_BENCH_BASELINE=bench_baseline.json pytest test_bench_triangle.py"""
+        threshold = float(os.getenv("TRIANGLE_BENCH_THRESHOLD", bench_triangle.DEFAULT_THRESHOLD))
+        baseline = load_baseline(os.environ["TRIANGLE_BENCH_BASELINE"])
+        regressions, lines = compare(baseline, run_suite(), threshold)
+        self.assertEqual(regressions, [], "\n".join(lines))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -1,9 +1,22 @@
 # test_github_api.py
+import io
+import json
+import os
+import tempfile
+import threading
+import time
 import unittest
 from unittest.mock import MagicMock, patch
 
 import github_api
-from github_api import GitHubAPIError, list_user_repos_with_commit_counts
+import github_ratelimit
+from github_api import (
+    GitHubAPIError,
+    iter_bulk_repos_with_commit_counts,
+    iter_repos_with_commit_counts,
+    list_user_repos_with_commit_counts,
+)
+from github_state import SyncState
 
 
 # ---- tiny response stub the mocks will return ----
@@ -34,12 +47,18 @@ def _mk_session(routes):
 
 
 class GithubApiTests(unittest.TestCase):
+    def setUp(self):
+        # 5xx responses are retried with backoff; don't actually sleep in tests
+        patcher = patch.object(github_ratelimit, "_sleep", lambda seconds: None)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     # ---------- helpers ----------
     def _repos_url(self, user):
         return f"https://api.github.com/users/{user}/repos?per_page=100"
 
     def _commits_url(self, user, repo):
-        return f"https://api.github.com/repos/{user}/{repo}/commits?per_page=100"
+        return f"https://api.github.com/repos/{user}/{repo}/commits?per_page=1"
 
     # ---------- tests ----------
     def test_happy_two_repos(self):
@@ -111,6 +130,195 @@ class GithubApiTests(unittest.TestCase):
             out = list_user_repos_with_commit_counts(user)
         self.assertEqual(out, [("Good", 2)])
 
+    def test_concurrent_commit_fetch_keeps_sorted_results(self):
+        """Many repos fetched on several threads still come back complete and sorted."""
+        user = "gina"
+        names = [f"repo{i:02d}" for i in range(30)]
+        routes = {self._repos_url(user): _Resp(200, [{"name": n} for n in reversed(names)])}
+        for i, n in enumerate(names):
+            routes[self._commits_url(user, n)] = _Resp(200, [{}] * (i % 5))
+
+        in_flight = {"now": 0, "max": 0}
+        lock = threading.Lock()
+
+        def _get(url, **kwargs):
+            with lock:
+                in_flight["now"] += 1
+                in_flight["max"] = max(in_flight["max"], in_flight["now"])
+            time.sleep(0.005)
+            with lock:
+                in_flight["now"] -= 1
+            return routes[url]
+
+        fake_session = MagicMock()
+        fake_session.get.side_effect = _get
+        with patch.object(github_api, "_new_session", return_value=fake_session):
+            out = list_user_repos_with_commit_counts(user, max_workers=4)
+        self.assertEqual(out, [(n, i % 5) for i, n in enumerate(names)])
+        self.assertGreater(in_flight["max"], 1)
+        self.assertLessEqual(in_flight["max"], 4)
+
+    def test_concurrent_fail_fast_cancels_outstanding(self):
+        """The first GitHubAPIError is raised without fetching every remaining repo."""
+        user = "hank"
+        names = [f"r{i:02d}" for i in range(40)]
+        routes = {self._repos_url(user): _Resp(200, [{"name": n} for n in names])}
+        for n in names:
+            routes[self._commits_url(user, n)] = _Resp(200, [{}])
+        routes[self._commits_url(user, "r00")] = _Resp(500, {"err": "boom"})
+
+        def _get(url, **kwargs):
+            if not url.endswith("r00/commits?per_page=1") and "/commits" in url:
+                time.sleep(0.02)
+            return routes[url]
+
+        fake_session = MagicMock()
+        fake_session.get.side_effect = _get
+        with patch.object(github_api, "_new_session", return_value=fake_session):
+            with self.assertRaises(GitHubAPIError):
+                list_user_repos_with_commit_counts(user, max_workers=2)
+        self.assertLess(fake_session.get.call_count, len(names))
+
+    def test_commit_count_from_link_header(self):
+        """Exact count comes from the rel="last" page number, not the body length."""
+        user = "ivy"
+        commits = self._commits_url(user, "Big")
+        link = (
+            '<https://api.github.com/repositories/1/commits?per_page=1&page=2>; rel="next", '
+            '<https://api.github.com/repositories/1/commits?per_page=1&page=1234>; rel="last"'
+        )
+        routes = {
+            self._repos_url(user): _Resp(200, [{"name": "Big"}, {"name": "One"}]),
+            commits: _Resp(200, [{}], headers={"Link": link}),
+            self._commits_url(user, "One"): _Resp(200, [{}]),
+        }
+        fake_session = _mk_session(routes)
+        with patch.object(github_api, "_new_session", return_value=fake_session):
+            out = list_user_repos_with_commit_counts(user)
+        self.assertEqual(out, [("Big", 1234), ("One", 1)])
+
+    def test_repo_listing_follows_next_links(self):
+        """Repos beyond the first page are listed by following rel="next"."""
+        user = "jack"
+        page2 = "https://api.github.com/user/99/repos?per_page=100&page=2"
+        routes = {
+            self._repos_url(user): _Resp(
+                200, [{"name": "A"}], headers={"Link": f'<{page2}>; rel="next", <{page2}>; rel="last"'}
+            ),
+            page2: _Resp(200, [{"name": "B"}]),
+            self._commits_url(user, "A"): _Resp(200, [{}]),
+            self._commits_url(user, "B"): _Resp(200, []),
+        }
+        fake_session = _mk_session(routes)
+        with patch.object(github_api, "_new_session", return_value=fake_session):
+            out = list_user_repos_with_commit_counts(user)
+        self.assertEqual(out, [("A", 1), ("B", 0)])
+
+    def test_parse_links(self):
+        resp = _Resp(headers={"Link": '<https://x/?page=2>; rel="next", <https://x/?page=9>; rel="last"'})
+        self.assertEqual(
+            github_api._parse_links(resp),
+            {"next": "https://x/?page=2", "last": "https://x/?page=9"},
+        )
+        self.assertEqual(github_api._parse_links(_Resp()), {})
+        self.assertEqual(github_api._page_number("https://x/?per_page=1&page=42"), 42)
+
+    def test_incremental_skips_unchanged_repos(self):
+        """With a SyncState only repos with a new pushed_at are re-counted."""
+        user = "kim"
+        routes = {
+            self._repos_url(user): _Resp(200, [
+                {"name": "Same", "pushed_at": "2024-01-01T00:00:00Z"},
+                {"name": "Moved", "pushed_at": "2024-01-01T00:00:00Z"},
+                {"name": "Gone", "pushed_at": "2024-01-01T00:00:00Z"},
+            ]),
+            self._commits_url(user, "Same"): _Resp(200, [{}, {}]),
+            self._commits_url(user, "Moved"): _Resp(200, [{}]),
+            self._commits_url(user, "Gone"): _Resp(200, [{}]),
+        }
+        with tempfile.TemporaryDirectory() as d:
+            state = SyncState(os.path.join(d, "state.sqlite"))
+            first = list_user_repos_with_commit_counts(user, _mk_session(routes), state=state)
+            self.assertEqual(first, [("Gone", 1), ("Moved", 1), ("Same", 2)])
+
+            routes[self._repos_url(user)] = _Resp(200, [
+                {"name": "Same", "pushed_at": "2024-01-01T00:00:00Z"},
+                {"name": "Moved", "pushed_at": "2024-02-01T00:00:00Z"},
+                {"name": "New", "pushed_at": "2024-02-01T00:00:00Z"},
+            ])
+            routes[self._commits_url(user, "Moved")] = _Resp(200, [{}, {}, {}])
+            routes[self._commits_url(user, "New")] = _Resp(200, [{}])
+            session = _mk_session(routes)
+            second = list_user_repos_with_commit_counts(user, session, state=state)
+            requested = [call.args[0] for call in session.get.call_args_list]
+            stored = state.load(user)
+            state.close()
+
+        self.assertEqual(second, [("Moved", 3), ("New", 1), ("Same", 2)])
+        self.assertNotIn(self._commits_url(user, "Same"), requested)
+        self.assertEqual(sorted(stored), ["Moved", "New", "Same"])  # "Gone" dropped
+
+    def test_incremental_state_untouched_on_error(self):
+        user = "lee"
+        routes = {
+            self._repos_url(user): _Resp(200, [{"name": "A", "pushed_at": "t1"}]),
+            self._commits_url(user, "A"): _Resp(500, {"err": "boom"}),
+        }
+        with tempfile.TemporaryDirectory() as d:
+            state = SyncState(os.path.join(d, "state.sqlite"))
+            with self.assertRaises(GitHubAPIError):
+                list_user_repos_with_commit_counts(user, _mk_session(routes), state=state)
+            self.assertEqual(state.load(user), {})
+            state.close()
+
+    def test_iter_yields_every_repo(self):
+        user = "mia"
+        names = [f"p{i}" for i in range(12)]
+        routes = {self._repos_url(user): _Resp(200, [{"name": n} for n in names])}
+        for i, n in enumerate(names):
+            routes[self._commits_url(user, n)] = _Resp(200, [{}] * (i % 2))
+        out = list(iter_repos_with_commit_counts(user, _mk_session(routes), max_workers=4))
+        self.assertEqual(sorted(out), sorted((n, i % 2) for i, n in enumerate(names)))
+
+    def _bulk_routes(self):
+        return {
+            self._repos_url("ann"): _Resp(200, [{"name": "X"}]),
+            self._commits_url("ann", "X"): _Resp(200, [{}]),
+            self._repos_url("bo"): _Resp(404, {"message": "Not Found"}),
+            self._repos_url("cy"): _Resp(200, [{"name": "Y"}, {"name": "Z"}]),
+            self._commits_url("cy", "Y"): _Resp(200, []),
+            self._commits_url("cy", "Z"): _Resp(409, {"message": "Git Repository is empty."}),
+        }
+
+    def test_bulk_dedupes_users_and_shares_one_session(self):
+        fake_session = _mk_session(self._bulk_routes())
+        users = ["ann", "  ", "# comment", "bo", "ANN", "cy"]
+        with patch.object(github_api, "_new_session", return_value=fake_session) as new_session:
+            records = list(iter_bulk_repos_with_commit_counts(users))
+        new_session.assert_called_once()
+        self.assertEqual(records[0], {"user": "ann", "repo": "X", "commits": 1})
+        self.assertEqual(records[1]["user"], "bo")
+        self.assertIn("404", records[1]["error"])
+        self.assertEqual(
+            sorted((r["repo"], r["commits"]) for r in records[2:]), [("Y", 0), ("Z", 0)]
+        )
+        requested = [call.args[0] for call in fake_session.get.call_args_list]
+        self.assertEqual(requested.count(self._repos_url("ann")), 1)
+
+    def test_main_streams_jsonl_for_a_users_file(self):
+        fake_session = _mk_session(self._bulk_routes())
+        with tempfile.TemporaryDirectory() as d:
+            users_file = os.path.join(d, "users.txt")
+            with open(users_file, "w") as f:
+                f.write("ann\ncy\n")
+            with patch.object(github_api, "_new_session", return_value=fake_session), \
+                    patch("sys.stdout", new_callable=io.StringIO) as out:
+                code = github_api.main(["--users-file", users_file, "--workers", "2"])
+        records = [json.loads(line) for line in out.getvalue().splitlines()]
+        self.assertEqual(code, 0)
+        self.assertEqual(len(records), 3)
+        self.assertEqual({r["user"] for r in records}, {"ann", "cy"})
+
 
 if __name__ == "__main__":
     unittest.main(verbosity=2)
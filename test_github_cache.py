@@ -0,0 +1,123 @@
+# test_github_cache.py
+import json
+import os
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import requests
+
+import github_api
+from github_cache import CachingAdapter, ResponseCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # path -> (etag, body); shared with the test through the server object
+    def do_GET(self):
+        etag, body = self.server.resources[self.path]
+        self.server.seen.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("X-RateLimit-Remaining", "59")
+            self.end_headers()
+            return
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.send_header("ETag", etag)
+        self.send_header("Link", '<http://x/?page=7>; rel="last"')
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class GithubCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db = os.path.join(self.tmpdir.name, "cache.sqlite")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self.server.resources = {"/a": ('"v1"', [1, 2, 3])}
+        self.server.seen = []
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/a"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.tmpdir.cleanup()
+
+    def _session(self, cache):
+        s = requests.Session()
+        s.mount("http://", CachingAdapter(cache))
+        return s
+
+    def test_304_served_from_cache(self):
+        cache = ResponseCache(self.db)
+        with self._session(cache) as s:
+            first = s.get(self.url)
+            second = s.get(self.url)
+        self.assertEqual(first.json(), [1, 2, 3])
+        self.assertFalse(first.from_cache)
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(second.json(), [1, 2, 3])
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.headers["Link"], '<http://x/?page=7>; rel="last"')
+        self.assertEqual(second.headers["X-RateLimit-Remaining"], "59")
+        self.assertEqual(self.server.seen[1].get("If-None-Match"), '"v1"')
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"], stats["entries"]), (1, 1, 1))
+        cache.close()
+
+    def test_changed_resource_is_refetched_and_shared_across_instances(self):
+        cache = ResponseCache(self.db)
+        with self._session(cache) as s:
+            s.get(self.url)
+        cache.close()
+
+        self.server.resources["/a"] = ('"v2"', [4])
+        other = ResponseCache(self.db)  # e.g. another process opening the same file
+        with self._session(other) as s:
+            self.assertEqual(s.get(self.url).json(), [4])
+            self.assertTrue(s.get(self.url).from_cache)
+        self.assertEqual(other.stats()["misses"], 1)
+        other.close()
+
+    def test_age_and_size_eviction(self):
+        cache = ResponseCache(self.db, max_age=0.05)
+        with self._session(cache) as s:
+            s.get(self.url)
+            time.sleep(0.1)
+            self.assertFalse(s.get(self.url).from_cache)  # expired copy is not used
+        cache.close()
+
+        self.server.resources["/b"] = ('"b"', list(range(15)))
+        small = ResponseCache(self.db, max_bytes=55)
+        with self._session(small) as s:
+            s.get(self.url)
+            s.get(self.url.replace("/a", "/b"))
+        self.assertEqual(small.stats()["entries"], 1)
+        self.assertGreaterEqual(small.stats()["evictions"], 1)
+        small.close()
+
+    def test_new_session_uses_env_cache(self):
+        old = os.environ.get("GITHUB_API_CACHE")
+        os.environ["GITHUB_API_CACHE"] = self.db
+        try:
+            s = github_api._new_session()
+            self.assertIsInstance(s.get_adapter("https://api.github.com"), CachingAdapter)
+            s.close()
+        finally:
+            if old is None:
+                del os.environ["GITHUB_API_CACHE"]
+            else:
+                os.environ["GITHUB_API_CACHE"] = old
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
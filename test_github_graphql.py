@@ -0,0 +1,104 @@
+# test_github_graphql.py
+import json
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+import requests
+
+import github_graphql
+from github_api import GitHubAPIError, list_user_repos_with_commit_counts
+
+# login -> [(name, commit total or None for an empty repo)]
+_USERS = {
+    "octo": [("alpha", 5), ("Beta", None), ("gamma", 12), ("Delta", 1), ("eps", 3)],
+}
+_STUB_PAGE = 2  # the stub ignores pageSize so a handful of repos spans pages
+
+
+class _GraphQLStub(BaseHTTPRequestHandler):
+    def do_POST(self):
+        req = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        self.server.requests.append((dict(self.headers), req))
+        login = req["variables"]["login"]
+        if login == "boom":
+            payload = {"errors": [{"message": "Something went wrong"}]}
+        elif login not in _USERS:
+            payload = {"data": {"repositoryOwner": None}}
+        else:
+            start = int(req["variables"]["cursor"] or 0)
+            repos = _USERS[login][start:start + _STUB_PAGE]
+            nodes = [
+                {
+                    "name": name,
+                    "pushedAt": "2024-01-01T00:00:00Z",
+                    "defaultBranchRef": None if total is None else {
+                        "target": {"history": {"totalCount": total}}
+                    },
+                }
+                for name, total in repos
+            ]
+            end = start + len(repos)
+            payload = {"data": {"repositoryOwner": {"repositories": {
+                "pageInfo": {"hasNextPage": end < len(_USERS[login]), "endCursor": str(end)},
+                "nodes": nodes,
+            }}}}
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+class GithubGraphQLTests(unittest.TestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _GraphQLStub)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, args=(0.05,), daemon=True).start()
+        url = f"http://127.0.0.1:{self.server.server_address[1]}/graphql"
+        patcher = patch.object(github_graphql, "GRAPHQL_URL", url)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.session = requests.Session()
+        self.session.headers["Authorization"] = "Bearer test-token"
+
+    def tearDown(self):
+        self.session.close()
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_auto_backend_uses_graphql_with_token(self):
+        out = list_user_repos_with_commit_counts("octo", session=self.session)
+        self.assertEqual(
+            out, [("alpha", 5), ("Beta", 0), ("Delta", 1), ("eps", 3), ("gamma", 12)]
+        )
+        self.assertEqual(len(self.server.requests), 3)  # 5 repos, 2 per stub page
+        headers, body = self.server.requests[0]
+        self.assertEqual(headers["Authorization"], "Bearer test-token")
+        self.assertIn("totalCount", body["query"])
+        self.assertEqual(self.server.requests[1][1]["variables"]["cursor"], "2")
+
+    def test_unknown_user_and_graphql_errors_raise(self):
+        with self.assertRaises(GitHubAPIError):
+            list_user_repos_with_commit_counts("nobody", session=self.session)
+        with self.assertRaises(GitHubAPIError) as ctx:
+            list_user_repos_with_commit_counts("boom", session=self.session, backend="graphql")
+        self.assertIn("Something went wrong", str(ctx.exception))
+
+    def test_pages_carry_pushed_at(self):
+        pages = list(github_graphql.iter_repo_pages("octo", self.session))
+        self.assertEqual([len(p) for p in pages], [2, 2, 1])
+        self.assertEqual(pages[0][0], ("alpha", "2024-01-01T00:00:00Z", 5))
+
+    def test_bad_backend(self):
+        with self.assertRaises(ValueError):
+            list_user_repos_with_commit_counts("octo", session=self.session, backend="soap")
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
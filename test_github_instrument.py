@@ -0,0 +1,141 @@
+# test_github_instrument.py
+import json
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+import github_api
+import github_ratelimit
+from github_cache import ResponseCache
+from github_fake import FakeGitHubServer, bench
+from github_instrument import CassetteRecorder, RequestStats, load_cassette
+from github_ratelimit import RateLimitScheduler
+
+BASE = "https://api.github.com"
+
+
+def _cassette():
+    def it(path, body, link=None):
+        headers = {"Content-Type": "application/json"}
+        if link:
+            headers["Link"] = link
+        return {"method": "GET", "path": path, "body": None, "status": 200,
+                "headers": headers, "response": json.dumps(body)}
+
+    return {
+        "version": 1,
+        "base": BASE,
+        "interactions": [
+            it("/users/octo/repos?per_page=100", [{"name": "alpha", "pushed_at": "t1"}],
+               link=f'<{BASE}/user/1/repos?per_page=100&page=2>; rel="next"'),
+            it("/user/1/repos?per_page=100&page=2", [{"name": "beta", "pushed_at": "t2"}]),
+            it("/repos/octo/alpha/commits?per_page=1", [{"sha": "a"}],
+               link=f'<{BASE}/repositories/9/commits?per_page=1&page=42>; rel="last"'),
+            it("/repos/octo/beta/commits?per_page=1", [{"sha": "b"}]),
+        ],
+    }
+
+
+class GithubInstrumentTests(unittest.TestCase):
+    def setUp(self):
+        p = patch.object(github_ratelimit, "_sleep", lambda s: None)
+        p.start()
+        self.addCleanup(p.stop)
+
+    def _sync(self, url, hooks=(), session=None, workers=2):
+        sched = RateLimitScheduler()
+        sched.hooks.extend(hooks)
+        with patch.object(github_api, "API_URL", url):
+            return github_api.list_user_repos_with_commit_counts(
+                "octo", session=session or github_api._new_session(), max_workers=workers,
+                scheduler=sched, backend="rest",
+            )
+
+    def test_stats_count_retries_status_and_bytes(self):
+        ok = MagicMock(status_code=200, content=b"hello", headers={}, from_cache=False)
+        bad = MagicMock(status_code=502, content=b"", headers={})
+        session = MagicMock()
+        session.get.side_effect = [bad, ok]
+        stats = RequestStats()
+        sched = RateLimitScheduler()
+        sched.hooks.append(stats)
+
+        self.assertIs(sched.get(session, "http://x/"), ok)
+        s = stats.summary()
+        self.assertEqual(s["requests"], 2)
+        self.assertEqual(s["retries"], 1)
+        self.assertEqual(s["status"], {"502": 1, "200": 1})
+        self.assertEqual(s["bytes"], 5)
+        self.assertEqual(s["cache"], {"hits": 0, "misses": 1})
+        self.assertIn("requests: 2 (retries: 1", stats.format_summary())
+
+    def test_fake_server_replays_cassette(self):
+        stats = RequestStats()
+        with FakeGitHubServer(_cassette()) as srv:
+            rows = self._sync(srv.url, hooks=[stats])
+            self.assertEqual(srv.requests, 4)
+        self.assertEqual(rows, [("alpha", 42), ("beta", 1)])
+        s = stats.summary()
+        self.assertEqual(s["requests"], 4)
+        self.assertEqual(s["status"], {"200": 4})
+        self.assertGreater(s["bytes"], 0)
+
+    def test_recorded_cassette_replays_identically(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "c.json")
+            with FakeGitHubServer(_cassette()) as srv:
+                recorder = CassetteRecorder(base=srv.url)
+                expected = self._sync(srv.url, hooks=[recorder])
+            recorder.save(path)
+            cassette = load_cassette(path)
+
+        self.assertEqual(len(cassette["interactions"]), 4)
+        with FakeGitHubServer(cassette) as srv:
+            self.assertEqual(self._sync(srv.url), expected)
+
+    def test_conditional_requests_are_cache_hits_and_free(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = ResponseCache(os.path.join(tmp, "cache.sqlite"))
+            stats = RequestStats()
+            with FakeGitHubServer(_cassette(), rate_limit=100) as srv:
+                self._sync(srv.url, session=github_api._new_session(cache=cache))
+                rows = self._sync(srv.url, hooks=[stats],
+                                  session=github_api._new_session(cache=cache))
+                r = requests.get(f"{srv.url}/users/octo/repos?per_page=100")
+            cache.close()
+        self.assertEqual(rows, [("alpha", 42), ("beta", 1)])
+        self.assertEqual(stats.summary()["cache"], {"hits": 4, "misses": 0})
+        # 4 charged requests on the first pass, none on the second, then this one
+        self.assertEqual(r.headers["X-RateLimit-Remaining"], "95")
+
+    def test_rate_limit_exhaustion_returns_403(self):
+        with FakeGitHubServer(_cassette(), rate_limit=1) as srv:
+            url = f"{srv.url}/repos/octo/beta/commits?per_page=1"
+            first, second = requests.get(url), requests.get(url)
+            missing = requests.get(f"{srv.url}/nope")
+        self.assertEqual(first.status_code, 200)
+        self.assertEqual(first.headers["X-RateLimit-Remaining"], "0")
+        self.assertEqual(second.status_code, 403)
+        self.assertEqual(missing.status_code, 403)
+
+    def test_unknown_request_is_404(self):
+        with FakeGitHubServer(_cassette()) as srv:
+            r = requests.get(f"{srv.url}/nope")
+        self.assertEqual(r.status_code, 404)
+        self.assertIn("no cassette entry", r.json()["message"])
+
+    def test_bench_modes(self):
+        results = bench(_cassette(), "octo", workers=2)
+        self.assertEqual(list(results), ["serial", "concurrent", "cached"])
+        for mode in results.values():
+            self.assertEqual(mode["repos"], 2)
+            self.assertEqual(mode["requests"], 4)
+        self.assertEqual(results["cached"]["cache"]["hits"], 4)
+        self.assertEqual(results["serial"]["cache"]["hits"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
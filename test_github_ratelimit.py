@@ -0,0 +1,174 @@
+# test_github_ratelimit.py
+import unittest
+from unittest.mock import MagicMock
+
+import requests
+
+from github_ratelimit import RateLimitScheduler
+
+
+class _Resp:
+    def __init__(self, status_code=200, headers=None, text=""):
+        self.status_code = status_code
+        self.headers = headers or {}
+        self.text = text
+
+
+class _FakeTime:
+    """Clock + sleep pair: sleeping just moves the clock forward."""
+
+    def __init__(self, start=1_000_000.0):
+        self.now = start
+        self.sleeps = []
+
+    def clock(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+def _session(*responses):
+    session = MagicMock()
+    session.get.side_effect = list(responses)
+    return session
+
+
+class RateLimitSchedulerTests(unittest.TestCase):
+    def setUp(self):
+        self.t = _FakeTime()
+
+    def _scheduler(self, **kwargs):
+        return RateLimitScheduler(clock=self.t.clock, sleep=self.t.sleep, **kwargs)
+
+    def test_retries_5xx_with_backoff(self):
+        sched = self._scheduler(backoff_base=1.0)
+        session = _session(_Resp(502), _Resp(503), _Resp(200))
+        resp = sched.get(session, "https://x", timeout=20)
+        self.assertEqual(resp.status_code, 200)
+        self.assertEqual(session.get.call_count, 3)
+        self.assertEqual(sched.budget()["retries"], 2)
+        self.assertTrue(all(0 <= s <= 2.0 for s in self.t.sleeps))
+        session.get.assert_called_with("https://x", timeout=20)
+
+    def test_gives_up_after_max_retries(self):
+        sched = self._scheduler(max_retries=2)
+        resp = sched.get(_session(_Resp(500), _Resp(500), _Resp(500)), "https://x")
+        self.assertEqual(resp.status_code, 500)
+
+        err = requests.ConnectionError("down")
+        with self.assertRaises(requests.ConnectionError):
+            sched.get(_session(err, err, err), "https://x")
+        ok = sched.get(_session(err, _Resp(200)), "https://x")
+        self.assertEqual(ok.status_code, 200)
+
+    def test_honors_retry_after(self):
+        sched = self._scheduler()
+        session = _session(_Resp(429, {"Retry-After": "7"}), _Resp(200))
+        self.assertEqual(sched.get(session, "https://x").status_code, 200)
+        self.assertIn(7.0, self.t.sleeps)
+
+    def test_primary_limit_waits_for_reset(self):
+        sched = self._scheduler()
+        reset = int(self.t.now) + 30
+        exhausted = _Resp(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})
+        fresh = _Resp(200, {"X-RateLimit-Remaining": "4999", "X-RateLimit-Reset": str(reset + 3600)})
+        self.assertEqual(sched.get(_session(exhausted, fresh), "https://x").status_code, 200)
+        self.assertGreaterEqual(self.t.now, reset)
+        self.assertEqual(sched.budget()["remaining"], 4999)
+
+    def test_reset_too_far_returns_error_response(self):
+        sched = self._scheduler(max_wait=60)
+        reset = int(self.t.now) + 3000
+        exhausted = _Resp(403, {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(reset)})
+        self.assertEqual(sched.get(_session(exhausted), "https://x").status_code, 403)
+        self.assertEqual(self.t.sleeps, [])
+
+    def test_secondary_limit_and_plain_403(self):
+        sched = self._scheduler()
+        secondary = _Resp(403, text='{"message": "You have exceeded a secondary rate limit."}')
+        self.assertEqual(sched.get(_session(secondary, _Resp(200)), "https://x").status_code, 200)
+        self.assertIn(60.0, self.t.sleeps)
+
+        forbidden = _Resp(403, text='{"message": "Resource not accessible"}')
+        session = _session(forbidden)
+        self.assertEqual(sched.get(session, "https://x").status_code, 403)
+        self.assertEqual(session.get.call_count, 1)
+
+    def test_paces_when_budget_is_low(self):
+        sched = self._scheduler(pace_fraction=0.02)
+        reset = int(self.t.now) + 100
+        sched.update(_Resp(headers={
+            "X-RateLimit-Limit": "5000", "X-RateLimit-Remaining": "10", "X-RateLimit-Reset": str(reset),
+        }))
+        start = self.t.now
+        session = MagicMock()
+        session.get.return_value = _Resp(200)
+        for _ in range(3):
+            sched.get(session, "https://x")
+        # ~100s left for 10 requests: about 10s between request starts
+        self.assertGreaterEqual(self.t.now - start, 19.0)
+        self.assertLess(self.t.now - start, 40.0)
+
+    def test_small_sync_on_unauthenticated_limit_does_not_sleep(self):
+        # 60 requests/hour without a token: a 1 + 10 request sync fits easily
+        sched = self._scheduler()
+        reset = str(int(self.t.now) + 3600)
+        session = _session(*[
+            _Resp(200, {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": str(59 - i),
+                        "X-RateLimit-Reset": reset})
+            for i in range(11)
+        ])
+        for _ in range(11):
+            sched.get(session, "https://x")
+        self.assertEqual(self.t.sleeps, [])
+        self.assertEqual(sched.budget()["remaining"], 49)
+
+    def test_flat_remaining_from_free_304s_does_not_drain_budget(self):
+        sched = self._scheduler()
+        headers = {"X-RateLimit-Limit": "60", "X-RateLimit-Remaining": "50",
+                   "X-RateLimit-Reset": str(int(self.t.now) + 3000)}
+        session = MagicMock()
+        session.get.return_value = _Resp(304, headers)
+        for _ in range(60):
+            sched.get(session, "https://x")
+        self.assertEqual(self.t.sleeps, [])
+        self.assertEqual(sched.budget()["remaining"], 50)
+        self.assertEqual(sched.budget()["in_flight"], 0)
+
+    def test_budget_follows_header_within_window(self):
+        sched = self._scheduler()
+        sched.update(_Resp(headers={"X-RateLimit-Remaining": "50", "X-RateLimit-Reset": "2000000"}))
+        sched.update(_Resp(headers={"X-RateLimit-Remaining": "52", "X-RateLimit-Reset": "2000000"}))
+        self.assertEqual(sched.budget()["remaining"], 52)
+        sched.update(_Resp(headers={"X-RateLimit-Remaining": "5000", "X-RateLimit-Reset": "2003600"}))
+        self.assertEqual(sched.budget()["remaining"], 5000)
+        # a straggler from the old window does not overwrite the new one
+        sched.update(_Resp(headers={"X-RateLimit-Remaining": "3", "X-RateLimit-Reset": "2000000"}))
+        self.assertEqual(sched.budget()["remaining"], 5000)
+
+    def test_graphql_and_rest_budgets_are_separate(self):
+        sched = self._scheduler()
+        now = int(self.t.now)
+        graphql_out = _Resp(200, {"X-RateLimit-Resource": "graphql", "X-RateLimit-Limit": "5000",
+                                  "X-RateLimit-Remaining": "0", "X-RateLimit-Reset": str(now + 600)})
+        core = _Resp(200, {"X-RateLimit-Resource": "core", "X-RateLimit-Limit": "5000",
+                           "X-RateLimit-Remaining": "4000", "X-RateLimit-Reset": str(now + 1200)})
+        session = MagicMock()
+        session.post.return_value = graphql_out
+        session.get.return_value = core
+        sched.post(session, "https://api.github.com/graphql", json={})
+        sched.get(session, "https://api.github.com/users/x/repos")
+        sched.get(session, "https://api.github.com/users/x/repos")
+        self.assertEqual(self.t.sleeps, [])
+        self.assertEqual(sched.budget()["remaining"], 4000)
+        self.assertEqual(sched.budget("graphql")["remaining"], 0)
+
+        # only the GraphQL bucket waits for its reset
+        sched.post(session, "https://api.github.com/graphql", json={})
+        self.assertEqual(self.t.sleeps, [600.0])
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,46 @@
+# test_triangle_classifier.py
+import itertools
+import unittest
+
+from Triangle import classifyTriangle
+from triangle_classifier import ClassifierConfig, TriangleClassifier
+
+
+class TriangleClassifierTests(unittest.TestCase):
+    def test_default_config_matches_classifyTriangle(self):
+        clf = TriangleClassifier()
+        edge = (-1, 0, 1, 2, 3, 4, 5, 6, 7, 8, 10, 12, 13, 199, 200, 201)
+        for t in itertools.product(edge, repeat=3):
+            self.assertEqual(clf.classifyTriangle(*t), classifyTriangle(*t), t)
+        self.assertEqual(clf.classifyTriangle(3, 4, 5.0), "InvalidInput")
+
+    def test_configurable_bound_and_big_ints(self):
+        clf = TriangleClassifier(ClassifierConfig(max_side=None))
+        k = 10**40
+        self.assertEqual(clf.classifyTriangle(3 * k, 4 * k, 5 * k), "Right Scalene Triangle")
+        self.assertEqual(clf.classifyTriangle(k, k, k + 1), "Isosceles Triangle")
+        self.assertEqual(clf.classifyTriangle(k, 1, 1), "NotATriangle")
+
+        bounded = TriangleClassifier(ClassifierConfig(max_side=1000))
+        self.assertEqual(bounded.classifyTriangle(600, 800, 1000), "Right Scalene Triangle")
+        self.assertEqual(bounded.classifyTriangle(600, 800, 1001), "InvalidInput")
+
+    def test_float_mode(self):
+        clf = TriangleClassifier(ClassifierConfig(max_side=None, mode="float", rel_tol=1e-6))
+        self.assertEqual(clf.classifyTriangle(3.0, 4.0, 5.0000001), "Right Scalene Triangle")
+        self.assertEqual(clf.classifyTriangle(1.0, 1.0, 2 ** 0.5), "Right Isosceles Triangle")
+        self.assertEqual(clf.classifyTriangle(2.5, 2.5, 2.5000001), "Equilateral Triangle")
+        self.assertEqual(clf.classifyTriangle(1.0, 2.0, 3.0000001), "NotATriangle")
+        self.assertEqual(clf.classifyTriangle(1.0, float("nan"), 1.0), "InvalidInput")
+        self.assertEqual(clf.classifyTriangle(1.0, "1", 1.0), "InvalidInput")
+        self.assertEqual(clf.classifyTriangle(10**400, 1, 1), "InvalidInput")
+
+    def test_bad_config(self):
+        with self.assertRaises(ValueError):
+            ClassifierConfig(mode="complex")
+        with self.assertRaises(ValueError):
+            ClassifierConfig(max_side=0)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
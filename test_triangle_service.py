@@ -0,0 +1,116 @@
+# test_triangle_service.py
+import asyncio
+import json
+import unittest
+
+from Triangle import classifyTriangle
+from triangle_service import ClassifierService, classify_batch
+
+
+async def _http(port, method, path, payload=None):
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = b"" if payload is None else json.dumps(payload).encode()
+    writer.write(
+        f"{method} {path} HTTP/1.1\r\nHost: x\r\nContent-Length: {len(body)}\r\n"
+        "Connection: close\r\n\r\n".encode() + body
+    )
+    await writer.drain()
+    raw = await reader.read()
+    writer.close()
+    head, _, data = raw.partition(b"\r\n\r\n")
+    return int(head.split()[1]), json.loads(data)
+
+
+class TriangleServiceTests(unittest.TestCase):
+    def test_classify_batch_matches_scalar(self):
+        keys = [(a, b, c) for a in range(0, 8) for b in range(a, 8) for c in range(b, 8)]
+        keys.append((1, 1, 201))
+        self.assertEqual(classify_batch(keys), [classifyTriangle(*k) for k in keys])
+
+    def test_concurrent_requests_are_coalesced_and_cached(self):
+        async def go():
+            svc = ClassifierService(batch_window=0.01)
+            first = await asyncio.gather(
+                svc.classify_many([[3, 4, 5]]),
+                svc.classify_many([[5, 4, 3], [5, 5, 5]]),
+                svc.classify_many([[1, 2, 3], [3, 4, 5.0], "junk"]),
+            )
+            second = await svc.classify_many([[4, 3, 5]])
+            return first, second, svc.stats()
+
+        first, second, stats = asyncio.run(go())
+        self.assertEqual(first, [
+            ["Right Scalene Triangle"],
+            ["Right Scalene Triangle", "Equilateral Triangle"],
+            ["NotATriangle", "InvalidInput", "InvalidInput"],
+        ])
+        self.assertEqual(second, ["Right Scalene Triangle"])
+        self.assertEqual(stats["batches"], 1)       # one micro-batch for the gather
+        self.assertEqual(stats["cache"]["hits"], 1)  # (4, 3, 5) normalizes to (3, 4, 5)
+        self.assertEqual(stats["cache"]["size"], 3)
+        self.assertEqual(stats["requests"], 4)
+
+    def test_lru_eviction(self):
+        async def go():
+            svc = ClassifierService(cache_size=2, batch_window=0)
+            for t in ([3, 4, 5], [5, 5, 5], [3, 4, 5], [4, 5, 6]):
+                await svc.classify_many([t])
+            return svc
+
+        svc = asyncio.run(go())
+        self.assertEqual(list(svc._cache), [(3, 4, 5), (4, 5, 6)])
+
+    def test_http_endpoints(self):
+        async def go():
+            svc = ClassifierService(batch_window=0)
+            server = await svc.serve("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                single = await _http(port, "POST", "/classify", {"sides": [5, 5, 7]})
+                batch = await _http(port, "POST", "/classify", {"batch": [[3, 4, 5], [0, 1, 1]]})
+                bad = await _http(port, "POST", "/classify", {"nope": 1})
+                missing = await _http(port, "GET", "/nowhere")
+                stats = await _http(port, "GET", "/stats")
+            return single, batch, bad, missing, stats
+
+        single, batch, bad, missing, stats = asyncio.run(go())
+        self.assertEqual(single, (200, {"result": "Isosceles Triangle"}))
+        self.assertEqual(batch, (200, {"results": ["Right Scalene Triangle", "InvalidInput"]}))
+        self.assertEqual(bad[0], 400)
+        self.assertEqual(missing[0], 404)
+        self.assertEqual(stats[0], 200)
+        self.assertEqual(stats[1]["requests"], 2)
+        self.assertIn("p99", stats[1]["latency_ms"])
+
+    def test_bad_content_length_is_400(self):
+        async def send(port, head, body=b""):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(head.encode() + body)
+            await writer.drain()
+            raw = await reader.read()
+            writer.close()
+            return int(raw.split()[1])
+
+        def post(length, extra=""):
+            return (f"POST /classify HTTP/1.1\r\nContent-Length: {length}\r\n"
+                    f"Connection: close\r\n{extra}\r\n")
+
+        deep = b"[" * 20000
+
+        async def go():
+            svc = ClassifierService(batch_window=0)
+            server = await svc.serve("127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                return (
+                    await send(port, post(-5)),
+                    await send(port, post("abc")),
+                    await send(port, post(0, f"X-Big: {'a' * 70000}\r\n")),
+                    await send(port, post(len(deep)), deep),
+                )
+
+        self.assertEqual(asyncio.run(go()), (400, 400, 431, 400))
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,94 @@
+# test_triangle_stream.py
+import io
+import json
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stderr
+
+import triangle_stream
+from Triangle import classifyTriangle
+from triangle_stream import stream_classify
+
+
+class TriangleStreamTests(unittest.TestCase):
+    CSV_IN = "3,4,5\n5,5,5\n1,2,3\n3,4,5.5\n0,1,1\nx,y,z\n1,2\n"
+    CSV_OUT = (
+        "3,4,5,Right Scalene Triangle\n"
+        "5,5,5,Equilateral Triangle\n"
+        "1,2,3,NotATriangle\n"
+        "3,4,5.5,InvalidInput\n"
+        "0,1,1,InvalidInput\n"
+        "x,y,z,InvalidInput\n"
+        "1,2,InvalidInput\n"
+    )
+
+    def _run(self, text, fmt="csv", **kwargs):
+        out = io.StringIO()
+        rows = stream_classify(io.StringIO(text), out, fmt, **kwargs)
+        return rows, out.getvalue()
+
+    def test_csv_in_process(self):
+        rows, out = self._run(self.CSV_IN, chunk_size=2)
+        self.assertEqual(rows, 7)
+        self.assertEqual(out, self.CSV_OUT)
+
+    def test_csv_header(self):
+        _, out = self._run("a,b,c\n5,5,7\n", header=True)
+        self.assertEqual(out, "a,b,c,result\n5,5,7,Isosceles Triangle\n")
+
+    def test_jsonl_keeps_json_types(self):
+        lines = [[3, 4, 5], [3, 4, 5.0], {"a": 5, "b": 5, "c": 7}, "junk"]
+        text = "\n".join(json.dumps(x) for x in lines) + "\nnot json\n"
+        _, out = self._run(text, "jsonl")
+        results = [json.loads(line) for line in out.splitlines()]
+        self.assertEqual(
+            [r["result"] for r in results],
+            ["Right Scalene Triangle", "InvalidInput", "Isosceles Triangle",
+             "InvalidInput", "InvalidInput"],
+        )
+        self.assertEqual(results[2]["sides"], [5, 5, 7])
+
+    def test_process_pool_preserves_order(self):
+        triples = [(a, b, c) for a in range(1, 12) for b in range(1, 12) for c in range(1, 12)]
+        text = "".join(f"{a},{b},{c}\n" for a, b, c in triples)
+        rows, out = self._run(text, workers=2, chunk_size=37)
+        self.assertEqual(rows, len(triples))
+        expected = "".join(f"{a},{b},{c},{classifyTriangle(a, b, c)}\n" for a, b, c in triples)
+        self.assertEqual(out, expected)
+
+    def test_table_engine(self):
+        from triangle_table import save_table
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "tri.tbl")
+            save_table(path, bound=10)
+            _, out = self._run(self.CSV_IN, table_path=path)
+        self.assertEqual(out, self.CSV_OUT)
+
+    def test_main_files(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, "in.csv")
+            dst = os.path.join(d, "out.csv")
+            with open(src, "w") as f:
+                f.write(self.CSV_IN)
+            code = triangle_stream.main([src, "-o", dst, "--workers", "1", "--chunk-size", "3"])
+            with open(dst) as f:
+                self.assertEqual(f.read(), self.CSV_OUT)
+        self.assertEqual(code, 0)
+
+    def test_main_bad_paths_are_usage_errors(self):
+        with tempfile.TemporaryDirectory() as d:
+            src = os.path.join(d, "in.csv")
+            with open(src, "w") as f:
+                f.write(self.CSV_IN)
+            for argv in ([os.path.join(d, "nope.csv")],
+                         [src, "-o", os.path.join(d, "missing", "out.csv")]):
+                with redirect_stderr(io.StringIO()) as err, self.assertRaises(SystemExit) as cm:
+                    triangle_stream.main(argv)
+                self.assertEqual(cm.exception.code, 2)
+                self.assertIn("No such file", err.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
@@ -0,0 +1,71 @@
+# test_triangle_table.py
+import itertools
+import os
+import tempfile
+import unittest
+
+import triangle_table
+from Triangle import classifyTriangle
+from triangle_table import TableFormatError, TriangleTable, save_table, verify_table
+
+
+class TriangleTableTests(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "tri.tbl")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_lookup_matches_reference(self):
+        """Every triple in (and just outside) a small table answers like classifyTriangle."""
+        save_table(self.path, bound=20)
+        with TriangleTable(self.path) as table:
+            for t in itertools.product(range(-1, 24), repeat=3):
+                self.assertEqual(table.classifyTriangle(*t), classifyTriangle(*t), t)
+
+    def test_out_of_domain_falls_back(self):
+        save_table(self.path, bound=5)
+        with TriangleTable(self.path) as table:
+            self.assertEqual(table.classifyTriangle(200, 200, 200), "Equilateral Triangle")
+            self.assertEqual(table.classifyTriangle(3, 4, 5.0), "InvalidInput")
+            self.assertEqual(table.classifyTriangle(True, True, True), "Equilateral Triangle")
+            self.assertEqual(table.classifyTriangle(201, 2, 2), "InvalidInput")
+
+    def test_full_table_size(self):
+        self.assertEqual(triangle_table.table_size(200), 1353400)
+
+    def test_verify_ok_and_detects_corruption(self):
+        save_table(self.path, bound=10)
+        self.assertEqual(verify_table(self.path), [])
+        with open(self.path, "r+b") as f:
+            f.seek(triangle_table._HEADER.size)  # entry for (1, 1, 1)
+            f.write(bytes([1]))
+        problems = verify_table(self.path)
+        self.assertEqual(len(problems), 1)
+        self.assertIn("(1, 1, 1)", problems[0])
+
+    def test_rejects_bad_files(self):
+        with open(self.path, "wb") as f:
+            f.write(b"not a table at all")
+        with self.assertRaises(TableFormatError):
+            TriangleTable(self.path)
+
+        save_table(self.path, bound=3)
+        with open(self.path, "r+b") as f:
+            f.seek(6)
+            f.write(bytes([triangle_table.TABLE_VERSION + 1]))
+        with self.assertRaises(TableFormatError):
+            TriangleTable(self.path)
+
+    def test_cli_build_and_verify(self):
+        self.assertEqual(triangle_table.main(["build", self.path, "8"]), 0)
+        self.assertEqual(triangle_table.main(["verify", self.path]), 0)
+        self.assertEqual(triangle_table.main(["bogus"]), 2)
+        self.assertEqual(triangle_table.main(["build", self.path, "500"]), 2)
+        self.assertEqual(triangle_table.main(["build", self.path, "abc"]), 2)
+        self.assertEqual(triangle_table.main(["build", self.path, "-1"]), 2)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
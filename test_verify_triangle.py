@@ -0,0 +1,47 @@
+# test_verify_triangle.py
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import verify_triangle
+from Triangle import classifyTriangle
+from verify_triangle import oracle, verify_all
+
+
+class VerifyTriangleTests(unittest.TestCase):
+    def test_oracle_agrees_on_known_cases(self):
+        self.assertEqual(oracle(3, 4, 5), "Right Scalene Triangle")
+        self.assertEqual(oracle(5, 5, 7), "Isosceles Triangle")
+        self.assertEqual(oracle(1, 2, 3), "NotATriangle")
+        self.assertEqual(oracle(3, 4, 5.5), "InvalidInput")
+        self.assertEqual(oracle(201, 2, 2), "InvalidInput")
+
+    def test_small_cube_all_engines_clean(self):
+        from triangle_table import save_table
+
+        with tempfile.TemporaryDirectory() as d:
+            path = os.path.join(d, "tri.tbl")
+            save_table(path, bound=12)
+            checked, total, found = verify_all(lo=-1, hi=14, table_path=path)
+        self.assertEqual(checked, 16 ** 3)
+        self.assertEqual((total, found), (0, []))
+
+    def test_reports_first_mismatches(self):
+        def buggy(a, b, c):
+            return "Scalene Triangle" if (a, b, c) == (3, 4, 5) else classifyTriangle(a, b, c)
+
+        with patch.object(verify_triangle, "classifyTriangle", buggy):
+            checked, total, found = verify_all(lo=1, hi=6, engines=["classifyTriangle"])
+        self.assertEqual(total, 1)
+        self.assertEqual(found, [((3, 4, 5), "classifyTriangle", "Scalene Triangle",
+                                  "Right Scalene Triangle")])
+
+    def test_parallel_matches_serial(self):
+        serial = verify_all(lo=0, hi=9, engines=["classify_code", "batch"], workers=1)
+        parallel = verify_all(lo=0, hi=9, engines=["classify_code", "batch"], workers=2)
+        self.assertEqual(serial, parallel)
+
+
+if __name__ == "__main__":
+    unittest.main(verbosity=2)
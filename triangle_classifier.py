@@ -0,0 +1,110 @@
+"""
+triangle_classifier.py
+Configurable triangle classifier for inputs outside the homework's 1..200 range.
+
+  - max_side:  upper bound on every side (None = unbounded)
+  - mode:      "int"   exact Python ints (arbitrary precision, no overflow)
+               "float" ints or finite floats, compared with math.isclose
+
+With the default ClassifierConfig() the answers are exactly those of
+Triangle.classifyTriangle.
+
+Example:
+  clf = TriangleClassifier(ClassifierConfig(max_side=10**6))
+  clf.classifyTriangle(300000, 400000, 500000)   # "Right Scalene Triangle"
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from typing import Any, Optional, Union
+
+from Triangle import LABELS, TriangleKind
+
+Number = Union[int, float]
+
+
+@dataclass(frozen=True)
+class ClassifierConfig:
+    max_side: Optional[Number] = 200
+    mode: str = "int"
+    rel_tol: float = 1e-9
+    abs_tol: float = 0.0
+
+    def __post_init__(self) -> None:
+        if self.mode not in ("int", "float"):
+            raise ValueError(f"mode must be 'int' or 'float', got {self.mode!r}")
+        if self.max_side is not None and not self.max_side > 0:
+            raise ValueError("max_side must be positive or None")
+
+
+class TriangleClassifier:
+    """Triangle classification driven by a ClassifierConfig."""
+
+    def __init__(self, config: Optional[ClassifierConfig] = None):
+        self.config = config or ClassifierConfig()
+
+    def _valid_int(self, a: Any, b: Any, c: Any) -> bool:
+        if not (isinstance(a, int) and isinstance(b, int) and isinstance(c, int)):
+            return False
+        hi = self.config.max_side
+        if hi is None:
+            return a > 0 and b > 0 and c > 0
+        return 0 < a <= hi and 0 < b <= hi and 0 < c <= hi
+
+    def _valid_float(self, a: Any, b: Any, c: Any) -> bool:
+        hi = self.config.max_side
+        for x in (a, b, c):
+            if not isinstance(x, (int, float)):
+                return False
+            try:
+                x = float(x)
+            except OverflowError:  # an int too large to be a float
+                return False
+            if not math.isfinite(x) or x <= 0:
+                return False
+            if hi is not None and x > hi:
+                return False
+        return True
+
+    def classify_code(self, a: Number, b: Number, c: Number) -> TriangleKind:
+        if self.config.mode == "float":
+            return self._classify_float(a, b, c)
+
+        if not self._valid_int(a, b, c):
+            return TriangleKind.INVALID
+        if a + b <= c or a + c <= b or b + c <= a:
+            return TriangleKind.NOT_A_TRIANGLE
+        if a == b == c:
+            return TriangleKind.EQUILATERAL
+        x, y, z = sorted((a, b, c))
+        is_right = x * x + y * y == z * z
+        is_isosceles = a == b or b == c or a == c
+        if is_isosceles:
+            return TriangleKind.RIGHT_ISOSCELES if is_right else TriangleKind.ISOSCELES
+        return TriangleKind.RIGHT_SCALENE if is_right else TriangleKind.SCALENE
+
+    def _classify_float(self, a: Number, b: Number, c: Number) -> TriangleKind:
+        if not self._valid_float(a, b, c):
+            return TriangleKind.INVALID
+        rel_tol, abs_tol = self.config.rel_tol, self.config.abs_tol
+
+        def close(p: float, q: float) -> bool:
+            return math.isclose(p, q, rel_tol=rel_tol, abs_tol=abs_tol)
+
+        x, y, z = sorted((float(a), float(b), float(c)))
+        # a (nearly) flat triangle counts as degenerate, i.e. not a triangle
+        if x + y <= z or close(x + y, z):
+            return TriangleKind.NOT_A_TRIANGLE
+        if close(x, y) and close(y, z):
+            return TriangleKind.EQUILATERAL
+        is_right = close(x * x + y * y, z * z)
+        is_isosceles = close(x, y) or close(y, z)  # sorted, so x~z implies both
+        if is_isosceles:
+            return TriangleKind.RIGHT_ISOSCELES if is_right else TriangleKind.ISOSCELES
+        return TriangleKind.RIGHT_SCALENE if is_right else TriangleKind.SCALENE
+
+    def classifyTriangle(self, a: Number, b: Number, c: Number) -> str:
+        """Same labels as Triangle.classifyTriangle, under this classifier's config."""
+        return LABELS[self.classify_code(a, b, c)]
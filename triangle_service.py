@@ -0,0 +1,327 @@
+"""
+triangle_service.py
+Local HTTP classification service (stdlib asyncio), over TCP or a Unix socket.
+
+Endpoints:
+  POST /classify   {"sides": [a, b, c]}            -> {"result": "<label>"}
+                   {"batch": [[a, b, c], ...]}     -> {"results": ["<label>", ...]}
+  GET  /stats      throughput, latency percentiles, cache hit rate, batch sizes
+
+Concurrent requests are coalesced into micro-batches (up to --max-batch triples,
+or whatever arrived within --batch-window ms) that go through the NumPy batch
+path when numpy is installed. Results are kept in a bounded LRU cache keyed on
+the sorted triple, since the classification does not depend on side order.
+
+Run:
+  python3 triangle_service.py --port 8567
+  python3 triangle_service.py --unix /tmp/triangle.sock
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict, deque
+from typing import Any, Deque, Dict, List, Optional, Sequence, Tuple
+
+import Triangle
+from Triangle import LABELS, classify_code
+from latency_stats import percentile
+
+DEFAULT_CACHE_SIZE = 65536
+DEFAULT_MAX_BATCH = 1024
+DEFAULT_BATCH_WINDOW = 0.002  # seconds
+LATENCY_SAMPLES = 10000
+MAX_BODY = 16 * 1024 * 1024
+
+Key = Tuple[int, int, int]
+
+
+class ClassifierService:
+    """Micro-batching, caching front end for the classifier (one per event loop)."""
+
+    def __init__(
+        self,
+        *,
+        cache_size: int = DEFAULT_CACHE_SIZE,
+        max_batch: int = DEFAULT_MAX_BATCH,
+        batch_window: float = DEFAULT_BATCH_WINDOW,
+    ):
+        self.cache_size = cache_size
+        self.max_batch = max_batch
+        self.batch_window = batch_window
+        self._cache: "OrderedDict[Key, str]" = OrderedDict()
+        self._pending: Dict[Key, List[asyncio.Future]] = {}
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+
+        self._started = time.monotonic()
+        self._requests = 0
+        self._triples = 0
+        self._hits = 0
+        self._misses = 0
+        self._batches = 0
+        self._batched_triples = 0
+        self._latencies: Deque[float] = deque(maxlen=LATENCY_SAMPLES)
+
+    # ---------- cache ----------
+    def _cache_get(self, key: Key) -> Optional[str]:
+        label = self._cache.get(key)
+        if label is not None:
+            self._cache.move_to_end(key)
+        return label
+
+    def _cache_put(self, key: Key, label: str) -> None:
+        if self.cache_size <= 0:
+            return
+        self._cache[key] = label
+        self._cache.move_to_end(key)
+        while len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+
+    # ---------- micro-batching ----------
+    def _enqueue(self, key: Key) -> asyncio.Future:
+        fut = asyncio.get_running_loop().create_future()
+        waiters = self._pending.get(key)
+        if waiters is not None:
+            waiters.append(fut)  # same triple already queued: share its answer
+            return fut
+        self._pending[key] = [fut]
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        return fut
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        keys = list(pending)
+        labels = classify_batch(keys)
+        self._batches += 1
+        self._batched_triples += len(keys)
+        for key, label in zip(keys, labels):
+            self._cache_put(key, label)
+            for fut in pending[key]:
+                if not fut.done():
+                    fut.set_result(label)
+
+    async def classify_many(self, triples: Sequence[Sequence[Any]]) -> List[str]:
+        """Classify a list of [a, b, c] triples, using the cache and micro-batches."""
+        start = time.perf_counter()
+        results: List[Any] = []
+        waiting: List[Tuple[int, asyncio.Future]] = []
+        for i, sides in enumerate(triples):
+            if not isinstance(sides, (list, tuple)) or len(sides) != 3:
+                results.append("InvalidInput")
+                continue
+            a, b, c = sides
+            if not (type(a) is int and type(b) is int and type(c) is int):
+                # floats/strings/bools: no cache (5.0 would hash like 5)
+                results.append(LABELS[classify_code(a, b, c)])
+                continue
+            key = _sort3(a, b, c)
+            label = self._cache_get(key)
+            if label is not None:
+                self._hits += 1
+                results.append(label)
+                continue
+            self._misses += 1
+            results.append(None)
+            waiting.append((i, self._enqueue(key)))
+        for i, fut in waiting:
+            results[i] = await fut
+
+        self._requests += 1
+        self._triples += len(triples)
+        self._latencies.append(time.perf_counter() - start)
+        return results
+
+    # ---------- stats ----------
+    def stats(self) -> Dict[str, Any]:
+        uptime = time.monotonic() - self._started
+        lat = sorted(self._latencies)
+        lookups = self._hits + self._misses
+        return {
+            "uptime_s": round(uptime, 3),
+            "requests": self._requests,
+            "triples": self._triples,
+            "requests_per_s": round(self._requests / uptime, 1) if uptime > 0 else 0.0,
+            "triples_per_s": round(self._triples / uptime, 1) if uptime > 0 else 0.0,
+            "latency_ms": {
+                f"p{p}": round(percentile(lat, p) * 1000, 3) for p in (50, 90, 99)
+            },
+            "cache": {
+                "size": len(self._cache),
+                "capacity": self.cache_size,
+                "hits": self._hits,
+                "misses": self._misses,
+                "hit_rate": round(self._hits / lookups, 4) if lookups else 0.0,
+            },
+            "batches": self._batches,
+            "mean_batch_size": round(self._batched_triples / self._batches, 2) if self._batches else 0.0,
+        }
+
+    # ---------- HTTP ----------
+    async def _route(self, method: str, path: str, body: bytes) -> Tuple[int, Dict[str, Any]]:
+        if path == "/stats":
+            if method != "GET":
+                return 405, {"error": "use GET"}
+            return 200, self.stats()
+        if path != "/classify":
+            return 404, {"error": f"no such endpoint: {path}"}
+        if method != "POST":
+            return 405, {"error": "use POST"}
+        try:
+            doc = json.loads(body or b"null")
+        except (ValueError, RecursionError) as e:  # RecursionError: absurdly deep nesting
+            return 400, {"error": f"bad JSON: {e}"}
+        if isinstance(doc, dict) and "sides" in doc:
+            return 200, {"result": (await self.classify_many([doc["sides"]]))[0]}
+        if isinstance(doc, dict) and isinstance(doc.get("batch"), list):
+            return 200, {"results": await self.classify_many(doc["batch"])}
+        return 400, {"error": 'expected {"sides": [a, b, c]} or {"batch": [[a, b, c], ...]}'}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Serve HTTP/1.1 requests (with keep-alive) on one connection."""
+        try:
+            while True:
+                try:
+                    request_line = await reader.readline()
+                except ValueError:  # longer than the stream limit (64 KiB)
+                    await _write_response(writer, 400, {"error": "request line too long"}, False)
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode("latin-1").split()
+                except ValueError:
+                    await _write_response(writer, 400, {"error": "bad request line"}, False)
+                    break
+                headers: Dict[str, str] = {}
+                try:
+                    while True:
+                        line = await reader.readline()
+                        if line in (b"\r\n", b"\n", b""):
+                            break
+                        name, _, value = line.decode("latin-1").partition(":")
+                        headers[name.strip().lower()] = value.strip()
+                except ValueError:
+                    await _write_response(writer, 431, {"error": "header line too long"}, False)
+                    break
+                try:
+                    length = int(headers.get("content-length", "0") or 0)
+                except ValueError:
+                    length = -1
+                if length < 0:
+                    await _write_response(writer, 400, {"error": "bad Content-Length"}, False)
+                    break
+                if length > MAX_BODY:
+                    await _write_response(writer, 413, {"error": "body too large"}, False)
+                    break
+                body = await reader.readexactly(length) if length else b""
+                keep_alive = (
+                    headers.get("connection", "").lower() != "close" and version == "HTTP/1.1"
+                )
+                status, payload = await self._route(method, target.split("?", 1)[0], body)
+                await _write_response(writer, status, payload, keep_alive)
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8567, unix_path: Optional[str] = None):
+        """Start listening; returns the asyncio server (use `async with` / serve_forever)."""
+        if unix_path:
+            return await asyncio.start_unix_server(self.handle, path=unix_path)
+        return await asyncio.start_server(self.handle, host, port)
+
+
+_REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+            413: "Payload Too Large", 431: "Request Header Fields Too Large"}
+
+
+async def _write_response(
+    writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any], keep_alive: bool
+) -> None:
+    body = json.dumps(payload).encode()
+    head = (
+        f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+        "Content-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\n"
+        f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+    )
+    writer.write(head.encode("latin-1") + body)
+    await writer.drain()
+
+
+def _sort3(a: int, b: int, c: int) -> Key:
+    if a > b:
+        a, b = b, a
+    if b > c:
+        b, c = c, b
+        if a > b:
+            a, b = b, a
+    return a, b, c
+
+
+def classify_batch(keys: Sequence[Key]) -> List[str]:
+    """Labels for a list of int triples, via classify_triangles when numpy is available."""
+    np = Triangle.np
+    if np is None or len(keys) < 16:
+        return [LABELS[classify_code(*k)] for k in keys]
+    labels: List[Optional[str]] = [None] * len(keys)
+    in_domain = []
+    for i, (a, b, c) in enumerate(keys):
+        if 0 < a and c <= 200:  # sorted, so a is the smallest and c the largest
+            in_domain.append(i)
+        else:
+            labels[i] = LABELS[Triangle.TriangleKind.INVALID]
+    if in_domain:
+        codes = Triangle.classify_triangles(np.array([keys[i] for i in in_domain], dtype=np.int32))
+        for i, code in zip(in_domain, codes.tolist()):
+            labels[i] = LABELS[code]
+    return labels  # type: ignore[return-value]
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(prog="triangle_service.py", description=__doc__.split("\n")[2])
+    p.add_argument("--host", default="127.0.0.1")
+    p.add_argument("--port", type=int, default=8567)
+    p.add_argument("--unix", help="listen on this Unix socket path instead of TCP")
+    p.add_argument("--cache-size", type=int, default=DEFAULT_CACHE_SIZE)
+    p.add_argument("--max-batch", type=int, default=DEFAULT_MAX_BATCH)
+    p.add_argument("--batch-window", type=float, default=DEFAULT_BATCH_WINDOW * 1000,
+                   help="ms to wait for more requests before flushing a batch")
+    args = p.parse_args(argv)
+
+    service = ClassifierService(
+        cache_size=args.cache_size,
+        max_batch=max(1, args.max_batch),
+        batch_window=args.batch_window / 1000,
+    )
+
+    async def run() -> None:
+        server = await service.serve(args.host, args.port, args.unix)
+        where = args.unix or f"http://{args.host}:{args.port}"
+        print(f"triangle service listening on {where}", file=sys.stderr)
+        async with server:
+            await server.serve_forever()
+
+    try:
+        asyncio.run(run())
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
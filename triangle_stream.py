@@ -0,0 +1,220 @@
+"""
+triangle_stream.py
+Streaming CSV/JSONL classification for Triangle.classifyTriangle.
+
+Input is read in chunks of --chunk-size lines and classified by a pool of
+--workers processes. At most a few chunks per worker are in flight at a time
+and results are written in input order, so memory stays constant no matter
+how large the input is.
+
+Input formats:
+  csv    one triple per line: "a,b,c" (optionally a header line, see --header)
+  jsonl  one triple per line: [a, b, c] or {"a": .., "b": .., "c": ..}
+
+Output mirrors the input with the label appended:
+  csv    "a,b,c,<label>"
+  jsonl  {"sides": [a, b, c], "result": "<label>"}
+
+Run:
+  python3 Triangle.py sides.csv --workers 8 --chunk-size 50000 -o out.csv
+  python3 Triangle.py - --format jsonl < sides.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import itertools
+import json
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Deque, Iterator, List, Optional, TextIO
+
+from Triangle import classifyTriangle
+
+DEFAULT_CHUNK_SIZE = 10000
+
+# per-process classifier; replaced by a table lookup when --table is given
+_classify: Callable[[Any, Any, Any], str] = classifyTriangle
+
+
+def _init_worker(table_path: Optional[str]) -> None:
+    global _classify
+    if table_path:
+        from triangle_table import TriangleTable
+        _classify = TriangleTable(table_path).classifyTriangle
+    else:
+        _classify = classifyTriangle
+
+
+def _parse_field(text: str) -> Any:
+    # CSV has no types: "3" -> 3, "5.5" -> 5.5 (InvalidInput, like the scalar API)
+    t = text.strip()
+    try:
+        return int(t)
+    except ValueError:
+        pass
+    try:
+        return float(t)
+    except ValueError:
+        return t
+
+
+def _classify_csv(lines: List[str]) -> str:
+    out = io.StringIO()
+    writer = csv.writer(out, lineterminator="\n")
+    for row in csv.reader(lines):
+        if not row:
+            continue
+        if len(row) == 3:
+            label = _classify(*(_parse_field(x) for x in row))
+        else:
+            label = "InvalidInput"
+        writer.writerow(row + [label])
+    return out.getvalue()
+
+
+def _classify_jsonl(lines: List[str]) -> str:
+    out = []
+    for line in lines:
+        if not line.strip():
+            continue
+        try:
+            obj = json.loads(line)
+        except ValueError:
+            obj = None
+        if isinstance(obj, dict):
+            sides = [obj.get("a"), obj.get("b"), obj.get("c")]
+        elif isinstance(obj, list) and len(obj) == 3:
+            sides = obj
+        else:
+            out.append(json.dumps({"sides": None, "result": "InvalidInput"}))
+            continue
+        out.append(json.dumps({"sides": sides, "result": _classify(*sides)}))
+    return "\n".join(out) + "\n" if out else ""
+
+
+_CHUNK_CLASSIFIERS = {"csv": _classify_csv, "jsonl": _classify_jsonl}
+
+
+def classify_chunk(fmt: str, lines: List[str]) -> str:
+    """Classify one chunk of raw input lines; returns the formatted output text."""
+    return _CHUNK_CLASSIFIERS[fmt](lines)
+
+
+def _chunks(infile: TextIO, chunk_size: int) -> Iterator[List[str]]:
+    while True:
+        chunk = list(itertools.islice(infile, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+def stream_classify(
+    infile: TextIO,
+    outfile: TextIO,
+    fmt: str = "csv",
+    *,
+    workers: int = 1,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    header: bool = False,
+    table_path: Optional[str] = None,
+) -> int:
+    """
+    Classify every line of infile and write results to outfile in input order.
+    Returns the number of input lines read (header excluded).
+    """
+    if fmt not in _CHUNK_CLASSIFIERS:
+        raise ValueError(f"unknown format {fmt!r}")
+    if workers < 1 or chunk_size < 1:
+        raise ValueError("workers and chunk_size must be >= 1")
+
+    if header and fmt == "csv":
+        first = infile.readline()
+        if first:
+            outfile.write(first.rstrip("\r\n") + ",result\n")
+
+    rows = 0
+    if workers == 1:
+        _init_worker(table_path)
+        try:
+            for chunk in _chunks(infile, chunk_size):
+                rows += len(chunk)
+                outfile.write(classify_chunk(fmt, chunk))
+        finally:
+            _init_worker(None)
+        return rows
+
+    # bounded window of in-flight chunks: constant memory, ordered output
+    max_in_flight = workers * 2
+    pending: Deque[Future] = deque()
+    with ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(table_path,)
+    ) as pool:
+        for chunk in _chunks(infile, chunk_size):
+            rows += len(chunk)
+            pending.append(pool.submit(classify_chunk, fmt, chunk))
+            if len(pending) >= max_in_flight:
+                outfile.write(pending.popleft().result())
+        while pending:
+            outfile.write(pending.popleft().result())
+    return rows
+
+
+def _guess_format(path: str) -> str:
+    return "jsonl" if path.endswith((".jsonl", ".ndjson", ".json")) else "csv"
+
+
+def main(argv: List[str]) -> int:
+    p = argparse.ArgumentParser(
+        prog="Triangle.py",
+        description="Classify side triples from a CSV or JSONL file (or '-' for stdin).",
+    )
+    p.add_argument("input", help="input file, or - for stdin")
+    p.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    p.add_argument("--format", choices=sorted(_CHUNK_CLASSIFIERS),
+                   help="input/output format (default: from the file extension, else csv)")
+    p.add_argument("--workers", type=int, default=os.cpu_count() or 1,
+                   help="worker processes (default: CPU count)")
+    p.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE,
+                   help=f"lines per chunk (default: {DEFAULT_CHUNK_SIZE})")
+    p.add_argument("--header", action="store_true", help="CSV input starts with a header line")
+    p.add_argument("--table", help="classify via a triangle_table.py lookup table file")
+    args = p.parse_args(argv)
+
+    if args.workers < 1 or args.chunk_size < 1:
+        p.error("--workers and --chunk-size must be >= 1")
+    fmt = args.format or _guess_format(args.input)
+
+    try:
+        infile = sys.stdin if args.input == "-" else open(args.input, newline="")
+    except OSError as e:
+        p.error(f"cannot read input: {e}")
+    try:
+        outfile = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    except OSError as e:
+        if infile is not sys.stdin:
+            infile.close()
+        p.error(f"cannot write output: {e}")
+    start = time.perf_counter()
+    try:
+        rows = stream_classify(
+            infile, outfile, fmt,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+            header=args.header,
+            table_path=args.table,
+        )
+    finally:
+        if infile is not sys.stdin:
+            infile.close()
+        if outfile is not sys.stdout:
+            outfile.close()
+    elapsed = time.perf_counter() - start
+    rate = rows / elapsed if elapsed > 0 else float("inf")
+    print(f"classified {rows} rows in {elapsed:.2f}s ({rate:,.0f} rows/sec)", file=sys.stderr)
+    return 0
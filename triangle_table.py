@@ -0,0 +1,211 @@
+"""
+triangle_table.py
+Precomputed lookup-table engine for Triangle.classifyTriangle.
+
+Valid inputs are bounded to 1..200, so every answer can be computed once and
+stored as one byte per *sorted* triple (x <= y <= z): C(202, 3) = 1,353,400 bytes.
+The table is saved in a small versioned file format and loaded with mmap, so
+many worker processes share one page-cached copy instead of each re-running
+the classification logic.
+
+File layout (little endian):
+  magic   6s   b"TRITBL"
+  version B    TABLE_VERSION
+  pad     x
+  bound   H    largest side covered by the table
+  count   I    number of entries that follow
+  entries count bytes, each a result code (index into Triangle.LABELS)
+
+Usage:
+  python3 triangle_table.py build triangle.tbl
+  python3 triangle_table.py verify triangle.tbl
+"""
+
+from __future__ import annotations
+
+import mmap
+import os
+import struct
+import sys
+from typing import List, Optional
+
+from Triangle import LABELS, classify_code, classifyTriangle
+
+TABLE_MAGIC = b"TRITBL"
+TABLE_VERSION = 1
+MAX_BOUND = 200  # same upper bound as Triangle._is_valid_inputs
+
+_HEADER = struct.Struct("<6sBxHI")
+_CODE_OF = {label: code for code, label in enumerate(LABELS)}
+
+
+class TableFormatError(Exception):
+    """Raised when a table file is missing, truncated or from another version."""
+    pass
+
+
+def table_size(bound: int) -> int:
+    """Number of sorted triples with sides in 1..bound, i.e. C(bound + 2, 3)."""
+    return bound * (bound + 1) * (bound + 2) // 6
+
+
+def _index(x: int, y: int, z: int) -> int:
+    # combinatorial number system over 0-based i <= j <= k
+    # (x, y, z must already be sorted and in 1..bound)
+    return (z - 1) * z * (z + 1) // 6 + (y - 1) * y // 2 + (x - 1)
+
+
+def build_table(bound: int = MAX_BOUND) -> bytearray:
+    """Compute the table by running the reference classifier on every sorted triple."""
+    if not 1 <= bound <= MAX_BOUND:
+        raise ValueError(f"bound must be in 1..{MAX_BOUND}, got {bound}")
+    out = bytearray(table_size(bound))
+    pos = 0
+    # loop order (z, then y, then x) walks _index() sequentially
+    for z in range(1, bound + 1):
+        for y in range(1, z + 1):
+            for x in range(1, y + 1):
+                out[pos] = _CODE_OF[classifyTriangle(x, y, z)]
+                pos += 1
+    return out
+
+
+def save_table(path: str, bound: int = MAX_BOUND, data: Optional[bytes] = None) -> None:
+    """
+    Build (unless data is given) and write the table to path.
+    Written to a temp file and renamed so readers never see a partial table.
+    """
+    if data is None:
+        data = build_table(bound)
+    if len(data) != table_size(bound):
+        raise ValueError("table data does not match bound")
+    tmp = f"{path}.tmp{os.getpid()}"
+    with open(tmp, "wb") as f:
+        f.write(_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, bound, len(data)))
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class TriangleTable:
+    """
+    A loaded (memory-mapped) classification table.
+
+    classifyTriangle() has the same signature and return values as
+    Triangle.classifyTriangle; triples outside the table fall back to
+    Triangle.classify_code.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, "rb") as f:
+            try:
+                self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:  # empty file
+                raise TableFormatError(f"{path}: empty table file") from None
+        try:
+            if len(self._mm) < _HEADER.size:
+                raise TableFormatError(f"{path}: truncated header")
+            magic, version, bound, count = _HEADER.unpack_from(self._mm, 0)
+            if magic != TABLE_MAGIC:
+                raise TableFormatError(f"{path}: not a triangle table")
+            if version != TABLE_VERSION:
+                raise TableFormatError(
+                    f"{path}: table version {version}, expected {TABLE_VERSION}"
+                )
+            if not 1 <= bound <= MAX_BOUND or count != table_size(bound):
+                raise TableFormatError(f"{path}: bad bound/count ({bound}, {count})")
+            if len(self._mm) != _HEADER.size + count:
+                raise TableFormatError(f"{path}: expected {count} entries")
+        except TableFormatError:
+            self._mm.close()
+            raise
+        self.bound = bound
+        self._base = _HEADER.size
+
+    def close(self) -> None:
+        self._mm.close()
+
+    def __enter__(self) -> "TriangleTable":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    def classify_code(self, a: int, b: int, c: int) -> int:
+        """Return the result code for (a, b, c); see Triangle.LABELS."""
+        bound = self.bound
+        # exact type check keeps bools and int subclasses on the reference path
+        if (
+            type(a) is int and type(b) is int and type(c) is int
+            and 0 < a <= bound and 0 < b <= bound and 0 < c <= bound
+        ):
+            # sort three values without building a list
+            if a > b:
+                a, b = b, a
+            if b > c:
+                b, c = c, b
+                if a > b:
+                    a, b = b, a
+            return self._mm[self._base + (c - 1) * c * (c + 1) // 6 + (b - 1) * b // 2 + a - 1]
+        return classify_code(a, b, c)
+
+    def classifyTriangle(self, a: int, b: int, c: int) -> str:
+        return LABELS[self.classify_code(a, b, c)]
+
+
+def verify_table(path: str) -> List[str]:
+    """
+    Check every entry of the table at path against the reference classifier.
+    Returns a list of human-readable mismatch descriptions (empty when OK).
+    """
+    problems: List[str] = []
+    with TriangleTable(path) as table:
+        expected = build_table(table.bound)
+        actual = table._mm[table._base:]
+        if actual == expected:
+            return problems
+        pos = 0
+        for z in range(1, table.bound + 1):
+            for y in range(1, z + 1):
+                for x in range(1, y + 1):
+                    if actual[pos] != expected[pos]:
+                        problems.append(
+                            f"({x}, {y}, {z}): table says {LABELS[actual[pos]]!r}, "
+                            f"expected {LABELS[expected[pos]]!r}"
+                        )
+                    pos += 1
+    return problems
+
+
+def main(argv: List[str]) -> int:
+    usage = f"Usage: python3 triangle_table.py build|verify <path> [bound (1..{MAX_BOUND})]"
+    if len(argv) not in (2, 3) or argv[0] not in ("build", "verify"):
+        print(usage)
+        return 2
+    cmd, path = argv[0], argv[1]
+    if cmd == "build":
+        bound = MAX_BOUND
+        if len(argv) == 3:
+            bound = int(argv[2]) if argv[2].isdigit() else 0
+        if not 1 <= bound <= MAX_BOUND:
+            print(usage)
+            return 2
+        save_table(path, bound)
+        print(f"wrote {table_size(bound)} entries (bound {bound}) to {path}")
+        return 0
+    try:
+        problems = verify_table(path)
+    except (OSError, TableFormatError) as e:
+        print(e)
+        return 1
+    for line in problems[:20]:
+        print(line)
+    if problems:
+        print(f"{len(problems)} mismatching entries")
+        return 1
+    print(f"{path}: OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))